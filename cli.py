@@ -1,9 +1,9 @@
+import concurrent.futures
+import functools
 import os
 import re
 import subprocess
-from typing import Tuple
-
-from library import format_readme_titles
+from typing import List, NamedTuple, Optional, Tuple
 
 
 PATTERN = re.compile(r"(.*?)  +(.*)")
@@ -15,13 +15,23 @@ PATTERN = re.compile(r"(.*?)  +(.*)")
 #         .*  - 0 of more repetitions of any character except a new line
 #           ) - End of group
 
-KEYWORDS = ["Options:", "Commands:"]
+KEYWORDS = frozenset({"Options:", "Commands:"})
 TEMPLATE = "---\ntitle: {}\n---"
 
 # Replace auto-genearted title as a key, provide the preferred title as the value
 MARKDOWN_TITLES = {"wandb": "Command Line Interface"}
 
 
+class CommandRecord(NamedTuple):
+    """The parsed help page of a single CLI command."""
+
+    command: str
+    usage: str
+    summary: str
+    options: List[list]
+    subcommands: List[list]
+
+
 def build(output_dir: str = None):
     """
     Entry point for docgen_cli.
@@ -36,63 +46,123 @@ def build(output_dir: str = None):
     if output_dir is None:
         output_dir = os.getcwd()
 
-    output_dir, output_file = prepare_dirs(output_dir, "cli")
+    # Phase 1: run and parse every --help page.
+    records = gather_command_records("wandb")
 
-    markdown_render("wandb", output_dir, output_file)
+    # Phase 2: render each page; pure string work, no I/O.
+    pages = {record.command: render_markdown(record) for record in records}
 
+    # Phase 3: lay out the directory tree and write the pages.
+    write_pages(output_dir, records, pages)
 
-def markdown_render(command: str, output_dir: str, output_file: str) -> str:
+
+def gather_command_records(command: str) -> List[CommandRecord]:
     """
-    Renders the markdown and also provides
-    the commands nested in it.
+    Fetches and parses the help pages of a command and its subcommands.
+
+    Walks the command tree one level at a time, running the `--help`
+    subprocesses of each level in parallel, and parses every page into a
+    `CommandRecord`. The records are returned in breadth-first order, so
+    a command always appears before its subcommands.
 
     Args:
-        command: (str) The command that is executed as `wandb command --help`
-        output_file: (str) The file in which the markdown is written.
+        command: (str) The root command, eg. `wandb`.
 
     Returns:
-        str: The output directory
+        list: A `CommandRecord` per command in the tree.
     """
-    usage, summary, parsed_dict = parse_help(command)
-    if usage:
-        # Document usage
-        usage = usage.split(":")
-        md_usage = usage[1].strip()
-        usage = f"**Usage**\n\n`{md_usage}`"
-    if summary:
-        # Document summary
-        summary = f"**Summary**\n{summary}"
-
-    if "Options:" in parsed_dict.keys():
-        options = get_options_markdown(parsed_dict["Options:"])
-    else:
-        options = ""
+    records = []
+    commands = [command]
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        while commands:
+            # Fill the run_help cache for this level of the command tree.
+            for _ in executor.map(run_help, commands):
+                pass
+            next_commands = []
+            for current in commands:
+                usage, summary, parsed_dict = parse_help(current)
+                record = CommandRecord(
+                    command=current,
+                    usage=usage,
+                    summary=summary,
+                    options=parsed_dict.get("Options:", []),
+                    subcommands=parsed_dict.get("Commands:", []),
+                )
+                records.append(record)
+                next_commands.extend(
+                    f"{current} {element[0]}" for element in record.subcommands
+                )
+            commands = next_commands
+    return records
+
+
+def render_markdown(record: CommandRecord) -> Optional[str]:
+    """
+    Renders the markdown page for a parsed command.
 
-    if "Commands:" in parsed_dict.keys():
-        subcommands, subcommand_list = get_subcommands_markdown(
-            command, parsed_dict["Commands:"]
-        )
-    else:
-        subcommands, subcommand_list = "", []
+    Args:
+        record: (CommandRecord) The parsed help page of the command.
 
-    # Write to the output file
-    if usage or summary or options or subcommands:
-        write_to_file(output_file, command, usage, summary, options, subcommands)
-        # Format README doc titles to perferred title
-        format_readme_titles(output_file, MARKDOWN_TITLES)
+    Returns:
+        str: The full page, or None if the help page had no content.
+    """
+    usage = summary = options = subcommands = ""
+    if record.usage:
+        # Document usage; only the part after the "Usage:" prefix matters.
+        md_usage = record.usage.partition(":")[2].strip()
+        usage = f"**Usage**\n\n`{md_usage}`"
+    if record.summary:
+        # Document summary
+        summary = f"**Summary**\n{record.summary}"
+    if record.options:
+        options = get_options_markdown(record.options)
+    if record.subcommands:
+        subcommands, _ = get_subcommands_markdown(record.command, record.subcommands)
+
+    if not (usage or summary or options or subcommands):
+        return None
+
+    # Apply the preferred title up front instead of rewriting it later.
+    title = MARKDOWN_TITLES.get(record.command, record.command)
+    parts = [TEMPLATE.format(title)]
+    for section in (usage, summary, options, subcommands):
+        if section:
+            parts.append("\n\n")
+            parts.append(section)
+    parts.append("\n")
+    return "".join(parts)
+
+
+def write_pages(output_dir: str, records: List[CommandRecord], pages: dict):
+    """
+    Creates the cli/ directory tree and writes each rendered page.
 
-    # render markdown for subcommands
-    if len(subcommand_list) > 0:
-        for command in subcommand_list:
-            # For `command --help`
-            command_dir_name = "-".join(command.split(" "))
-            output_dir, output_file = prepare_dirs(output_dir, command_dir_name)
+    Args:
+        output_dir: (str) The output directory for the generated CLI docs.
+        records: (list) The command records in breadth-first order.
+        pages: (dict) The rendered page (or None) keyed by command.
+    """
+    dirs = {}
+    for record in records:
+        command = record.command
+        if " " in command:
+            # Subcommands nest inside their parent command's directory.
+            parent_dir = dirs[command.rsplit(" ", 1)[0]]
+            subdir_name = "-".join(command.split(" "))
+        else:
+            parent_dir = output_dir
+            subdir_name = "cli"
+        command_dir, command_file = prepare_dirs(parent_dir, subdir_name)
+        dirs[command] = command_dir
 
-            output_dir = markdown_render(command, output_dir, output_file)
+        page = pages[command]
+        if page is not None:
+            with open(command_file, "w") as fp:
+                fp.write(page)
 
-    parent_path = os.path.dirname(output_dir)
 
-    return parent_path
+# Help pages already gathered by run_help, keyed by command.
+_HELP_CACHE = {}
 
 
 def run_help(command: str) -> str:
@@ -105,16 +175,28 @@ def run_help(command: str) -> str:
     Returns:
         str: The help page of the command.
     """
-    help_page = subprocess.run(
-        f"{command} --help", shell=True, capture_output=True, text=True
+    try:
+        return _HELP_CACHE[command]
+    except KeyError:
+        pass
+    # Invoke the command directly instead of paying for a shell per page.
+    output = subprocess.run(
+        command.split(" ") + ["--help"], capture_output=True
     ).stdout
+    help_page = output.decode("utf-8")
+    _HELP_CACHE[command] = help_page
     return help_page
 
 
+@functools.lru_cache(maxsize=None)
 def parse_help(command: str) -> Tuple[str, str, str]:
     """
     Gathers the help page of the command and then parses it.
 
+    The result is memoized per command: `gather_command_records` parses
+    every page once to discover subcommands, and the render pass reuses
+    those parses instead of repeating them.
+
     It is noted that the help page is structured in the following manner.
     ```bash
     Usage: ....
@@ -130,6 +212,21 @@ def parse_help(command: str) -> Tuple[str, str, str]:
     This help page is parsed in Usage, Summary and a Parsed Dict
     that contains Options and Commands.
 
+    The wandb CLI is made with the help of
+    [click](https://click.palletsprojects.com/), which wraps long lines.
+    A keyword-block line indented deeper than the usual two spaces is
+    therefore never a new entry; it is either the rest of a wrapped
+    description or a description pushed to its own line by a long option,
+    eg.
+    ```bash
+    --sync-tensorboard / --no-sync-tensorboard
+                                    Stream tfevent files to wandb.
+    --nvidia / --no-nvidia    Use the nvidia runtime, defaults to nvidia if
+                              nvidia-docker is present
+    ```
+    Such lines are folded into the entry that precedes them while the
+    page is tokenized, so the whole parse is a single pass over the page.
+
     Args:
         command (str): The command eg. wandb in `wandb --help`
 
@@ -137,40 +234,52 @@ def parse_help(command: str) -> Tuple[str, str, str]:
         str, str, str: usage, summary and the parsed document
     """
     help_page = run_help(command)
+
     summary = []
-    keyword = None  # initializing keyword with None
     parsed_dict = {}  # will hold Options and Commands
+    current = None  # entries of the keyword block being tokenized
+    for line in help_page.split("\n"):
+        stripped = line.strip()
+        if stripped in KEYWORDS:
+            current = parsed_dict.setdefault(stripped, [])
+            continue
 
-    help_page = pre_process(help_page)
+        if current is None:
+            # Usage line and summary; fold wrapped usage continuations
+            # into the line they overflowed from, drop blanks.
+            if not stripped:
+                continue
+            if len(line) - len(line.lstrip()) > 2 and summary:
+                summary[-1] += " " + stripped
+            else:
+                summary.append(stripped)
+            continue
 
-    full_line = ""
-    tmp = None
-    for line in help_page.split("\n"):
-        line = line.strip()
-        if line in KEYWORDS:  # Keywords contains [Options, Commands]
-            parsed_dict[line] = []
-            keyword = line
+        if not stripped:
+            continue
+        if len(line) - len(line.lstrip()) > 2 and current:
+            # Overflow line: complete or extend the previous entry.
+            previous = current[-1]
+            if previous[1]:
+                previous[1] += " " + stripped
+            else:
+                previous[1] = stripped
             continue
-        if keyword is None:
-            summary.append(line)
+        # PATTERN helps with option and value
+        # eg. --version Shows the version
+        # will be captured like
+        # ("--version", "Show the version")
+        extract = PATTERN.match(stripped)
+        if extract:
+            current.append([extract.group(1), extract.group(2)])
         else:
-            # handle multi line options
-            if keyword == "Options:" and not line.startswith("-"):
-                full_line += " " + line
-                continue
-            elif keyword == "Options:" and line.startswith("-"):
-                tmp = line
-                line = full_line
-            # PATTERN helps with option and value
-            # eg. --version Shows the version
-            # will be captured like
-            # [("--version","Show the version")]
-            extract = PATTERN.findall(line)
-            if extract:
-                parsed_dict[keyword].append([extract[0][0], extract[0][1]])
-            if tmp is not None:
-                full_line = tmp
-                tmp = None
+            # A long option whose description overflowed to the next line.
+            current.append([stripped, ""])
+
+    # Entries whose description never arrived are dropped, matching the
+    # `option   description` shape the renderer expects.
+    for entries in parsed_dict.values():
+        entries[:] = [entry for entry in entries if entry[1]]
 
     if len(summary) == 0:
         return "", "", parsed_dict
@@ -182,94 +291,22 @@ def parse_help(command: str) -> Tuple[str, str, str]:
         return usage, summary, parsed_dict
 
 
-def pre_process(help_page: str) -> str:
-    """
-    Transforms the help page of a command to better suit the needs of the parser.
-
-    The wandb CLI is made with the help of [click](https://click.palletsprojects.com/).
-    We have noticed the problem of line wrapping with this tool.
-    eg.
-    ```bash
-    --sync-tensorboard / --no-sync-tensorboard
-                                  Stream tfevent files to wandb.
-    --nvidia / --no-nvidia    Use the nvidia runtime, defaults to nvidia if
-                              nvidia-docker is present
-    ```
-    We find two types of overflow problems:
-    - new description: Due to the overflow of the option
-        `--sync-tensorboard / --no-sync-tensorboard`
-        the description `Stream tfevent files to wandb.`
-        is sent to the next line.
-    - wrapped description: Due to the overflow of the description
-        `Use the nvidia runtime, defaults to nvidia if`
-        the rest of the description is wrapped to the next line.
-
-    This breaks our parser that looks for lines with `option   description`.
-    With this function we transform these lines into the suitable format that our parser
-    expects.
-    ```bash
-    --sync-tensorboard / --no-sync-tensorboard   Stream tfevent files to wandb.
-    --nvidia / --no-nvidia   Use the nvidia runtime,
-       defaults to nvidia if nvidia-docker is present.
-    ```
-
-    Args:
-        help_page: The help page of a command gathered by `parse_help()`
-
-    Returns:
-        str: The transformed help page.
-    """
-    # The help page has a lot of components
-    # We need to sample the `option  description` lines, which starts
-    # with white spaces.
-    re_space = re.compile(r"(^\s+)")  # Regex to capture starting white spaces.
-
-    # Split the lines and iterate
-    page_splits = help_page.split("\n")
-    num_of_lines = len(page_splits)
-    for idx, line in enumerate(page_splits):
-        # Capture the starting white spaces of the line
-        white_space = re_space.findall(line)
-        num_white_space = len(white_space[0]) if white_space else 0
-        if num_white_space > 2:
-            # Can be either
-            # - wrapped description
-            # - new description
-            if num_of_lines >= idx + 1 and page_splits[idx + 1] == "":
-                # wrapped description
-                desc_1 = page_splits[idx - 1]
-                desc_2 = page_splits.pop(idx).strip()
-                page_splits[idx - 1] = desc_1 + " " + desc_2
-                # Remove the empty line
-                page_splits.pop(idx)
-            else:
-                # new description
-                option = page_splits[idx - 1]
-                description = page_splits.pop(idx).strip()
-                page_splits[idx - 1] = option + "   " + description
-    return "\n".join(page_splits)
-
-
 def get_options_markdown(options):
     """Formats the options of a command as a markdown table."""
-    options_md = ""
+    rows = ["""**Options**\n\n| **Option** | **Description** |\n| :--- | :--- |\n"""]
 
     for element in options:
         arg = parse_description(element)
         desc = element[1]
-        # concatenate all the options
-        options_md += f"""| {arg} | {desc} |\n"""
+        rows.append(f"""| {arg} | {desc} |\n""")
 
-    options_md = (
-        """**Options**\n\n| **Option** | **Description** |\n| :--- | :--- |\n"""
-        + options_md
-    )
-    return options_md
+    return "".join(rows)
 
 
 def get_subcommands_markdown(command, subcommands):
     """Formats the subcommands of a command as a markdown table."""
-    subcommands_md, subcommand_list = "", []
+    rows = ["""**Commands**\n\n| **Command** | **Description** |\n| :--- | :--- |\n"""]
+    subcommand_list = []
 
     for element in subcommands:
         subcommand_list.append(
@@ -277,14 +314,9 @@ def get_subcommands_markdown(command, subcommands):
         )  # Keeping a list of all the nested counts
         arg = parse_description(element)
         desc = element[1]
-        # concatenate all the options
-        subcommands_md += f"""| {arg} | {desc} |\n"""
-    subcommands_md = (
-        """**Commands**\n\n| **Command** | **Description** |\n| :--- | :--- |\n"""
-        + subcommands_md
-    )
+        rows.append(f"""| {arg} | {desc} |\n""")
 
-    return subcommands_md, subcommand_list
+    return "".join(rows), subcommand_list
 
 
 def parse_description(element):
@@ -300,27 +332,21 @@ def parse_description(element):
     the formatted line.
     """
     markdown = " ".join(
-        list(filter(lambda x: "" if x.isupper() else x, element[0].split(" ")))
+        token for token in element[0].split(" ") if token and not token.isupper()
     )
 
     return markdown
 
 
-def write_to_file(output_file, command, usage, summary, options, subcommands):
-    """Write contents to the output_file based on TEMPLATE"""
-
-    contents = TEMPLATE.format(command, usage, summary, options, subcommands)
-    with open(output_file, "w") as fp:
-        fp.write(contents)
-
-
 def prepare_dirs(base_dir, subdir_name):
     """Add a subdirectory with README to a base directory.
 
     Returns the directory and README paths.
     """
-    subdir = os.path.join(base_dir, subdir_name)
-    os.mkdir(path=subdir)
-    markdown_file = os.path.join(subdir, "README.md")
+    # Both pieces are plain relative names, so a separator join is all
+    # os.path.join would do anyway.
+    subdir = f"{base_dir}{os.sep}{subdir_name}"
+    os.makedirs(subdir, exist_ok=True)
+    markdown_file = f"{subdir}{os.sep}README.md"
 
     return subdir, markdown_file
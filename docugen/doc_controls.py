@@ -1,22 +1,47 @@
 """Documentation control decorators."""
+import functools
+import types
 from typing import Iterable, TypeVar
 
 T = TypeVar("T")
 
-_DEPRECATED = "_docs_deprecated"
+_NO_DICT = {}
+
+# All doc-control markers share one integer attribute, `_docugen_flags`:
+# a decorated object carries a single dict slot no matter how many
+# markers are applied, and every predicate is one dict probe plus a mask
+# test. The flags are always set with `setattr`, so they live in the
+# object's own `__dict__`; probing that directly avoids the full
+# attribute lookup (class hierarchy and descriptor protocol) that
+# `hasattr` pays for on every miss.
+_FLAGS_ATTR = "_docugen_flags"
+
+FLAG_DEPRECATED = 1
+FLAG_NO_SEARCH_HINTS = 2
+FLAG_DO_NOT_DOC = 4
+FLAG_DO_NOT_DOC_INHERITABLE = 8
+FLAG_FOR_SUBCLASS_IMPLEMENTERS = 16
+FLAG_DOC_PRIVATE = 32
+FLAG_DOC_IN_CURRENT_AND_SUBCLASSES = 64
+
+
+def _get_flags(obj) -> int:
+    """Returns the doc-control flags set on `obj` itself."""
+    return getattr(obj, "__dict__", _NO_DICT).get(_FLAGS_ATTR, 0)
+
+
+def _set_flag(obj, flag: int):
+    setattr(obj, _FLAGS_ATTR, _get_flags(obj) | flag)
 
 
 def set_deprecated(obj: T) -> T:
     """Explicitly tag an object as deprecated for the doc generator."""
-    setattr(obj, _DEPRECATED, None)
+    _set_flag(obj, FLAG_DEPRECATED)
     return obj
 
 
 def is_deprecated(obj) -> bool:
-    return hasattr(obj, _DEPRECATED)
-
-
-_NO_SEARCH_HINTS = "_docs_no_search_hints"
+    return bool(_get_flags(obj) & FLAG_DEPRECATED)
 
 
 def hide_from_search(obj: T) -> T:
@@ -33,13 +58,13 @@ def hide_from_search(obj: T) -> T:
     Returns:
       The object.
     """
-    setattr(obj, _NO_SEARCH_HINTS, None)
+    _set_flag(obj, FLAG_NO_SEARCH_HINTS)
     return obj
 
 
 def should_hide_from_search(obj) -> bool:
     """Returns true if metadata search hints should not be included."""
-    return hasattr(obj, _NO_SEARCH_HINTS)
+    return bool(_get_flags(obj) & FLAG_NO_SEARCH_HINTS)
 
 
 _CUSTOM_PAGE_CONTENT = "_docs_custom_page_content"
@@ -55,9 +80,6 @@ def get_custom_page_content(obj):
     return getattr(obj, _CUSTOM_PAGE_CONTENT, None)
 
 
-_DO_NOT_DOC = "_docs_do_not_document"
-
-
 def do_not_generate_docs(obj: T) -> T:
     """A decorator: Do not generate docs for this object.
 
@@ -132,13 +154,10 @@ def do_not_generate_docs(obj: T) -> T:
     Returns:
       obj
     """
-    setattr(obj, _DO_NOT_DOC, None)
+    _set_flag(obj, FLAG_DO_NOT_DOC)
     return obj
 
 
-_DO_NOT_DOC_INHERITABLE = "_docs_do_not_doc_inheritable"
-
-
 def do_not_doc_inheritable(obj: T) -> T:
     """A decorator: Do not generate docs for this method.
 
@@ -195,13 +214,10 @@ def do_not_doc_inheritable(obj: T) -> T:
     Returns:
       obj
     """
-    setattr(obj, _DO_NOT_DOC_INHERITABLE, None)
+    _set_flag(obj, FLAG_DO_NOT_DOC_INHERITABLE)
     return obj
 
 
-_FOR_SUBCLASS_IMPLEMENTERS = "_docs_tools_for_subclass_implementers"
-
-
 def for_subclass_implementers(obj: T) -> T:
     """A decorator: Only generate docs for this method in the defining class.
 
@@ -273,14 +289,12 @@ def for_subclass_implementers(obj: T) -> T:
     Returns:
       obj
     """
-    setattr(obj, _FOR_SUBCLASS_IMPLEMENTERS, None)
+    _set_flag(obj, FLAG_FOR_SUBCLASS_IMPLEMENTERS)
     return obj
 
 
 do_not_doc_in_subclasses = for_subclass_implementers
 
-_DOC_PRIVATE = "_docs_doc_private"
-
 
 def doc_private(obj: T) -> T:
     """A decorator: Generates docs for private methods/functions.
@@ -307,15 +321,12 @@ def doc_private(obj: T) -> T:
       obj
     """
 
-    setattr(obj, _DOC_PRIVATE, None)
+    _set_flag(obj, FLAG_DOC_PRIVATE)
     return obj
 
 
 def should_doc_private(obj) -> bool:
-    return hasattr(obj, _DOC_PRIVATE)
-
-
-_DOC_IN_CURRENT_AND_SUBCLASSES = "_docs_doc_in_current_and_subclasses"
+    return bool(_get_flags(obj) & FLAG_DOC_PRIVATE)
 
 
 def doc_in_current_and_subclasses(obj: T) -> T:
@@ -376,7 +387,7 @@ def doc_in_current_and_subclasses(obj: T) -> T:
       obj
     """
 
-    setattr(obj, _DOC_IN_CURRENT_AND_SUBCLASSES, None)
+    _set_flag(obj, FLAG_DOC_IN_CURRENT_AND_SUBCLASSES)
     return obj
 
 
@@ -392,17 +403,15 @@ def should_skip(obj) -> bool:
       True if the object should be skipped
     """
     if isinstance(obj, type):
-        # For classes, only skip if the attribute is set on _this_ class.
-        if _DO_NOT_DOC in obj.__dict__:
-            return True
-        else:
-            return False
+        # For classes, only skip if the flag is set on _this_ class
+        # (`_get_flags` only sees the class's own `__dict__`).
+        return bool(_get_flags(obj) & FLAG_DO_NOT_DOC)
 
     # Unwrap fget if the object is a property
     if isinstance(obj, property):
         obj = obj.fget
 
-    return hasattr(obj, _DO_NOT_DOC) or hasattr(obj, _DO_NOT_DOC_INHERITABLE)
+    return bool(_get_flags(obj) & (FLAG_DO_NOT_DOC | FLAG_DO_NOT_DOC_INHERITABLE))
 
 
 def _unwrap_func(obj):
@@ -416,9 +425,14 @@ def _unwrap_func(obj):
     return obj
 
 
+@functools.lru_cache(maxsize=None)
 def should_skip_class_attr(cls, name):
     """Returns true if docs should be skipped for this class attribute.
 
+    The result is cached per `(cls, name)` pair: the same attribute is
+    checked repeatedly when a class has duplicate aliases, and the answer
+    only depends on decorators applied at import time.
+
     Args:
       cls: The class the attribute belongs to.
       name: The name of the attribute.
@@ -426,59 +440,50 @@ def should_skip_class_attr(cls, name):
     Returns:
       True if the attribute should be skipped.
     """
-    # Get the object with standard lookup, from the nearest
-    # defining parent.
-    try:
-        obj = getattr(cls, name)
-    except AttributeError:
-        # Avoid error caused by enum metaclasses in python3
-        if name in ("name", "value"):
-            return True
-        raise
-
-    # Unwrap fget if the object is a property
-    obj = _unwrap_func(obj)
-
-    # Skip if the object is decorated with `do_not_generate_docs` or
-    # `do_not_doc_inheritable`
-    if should_skip(obj):
-        return True
-
-    # Use __dict__ lookup to get the version defined in *this* class.
-    obj = cls.__dict__.get(name, None)
-    obj = _unwrap_func(obj)
-
-    if obj is not None:
-        # If not none, the object is defined in *this* class.
-        # Do not skip if decorated with `for_subclass_implementers`.
-        if hasattr(obj, _FOR_SUBCLASS_IMPLEMENTERS):
-            return False
-
-        # If object is defined in this class, then don't skip if decorated with
-        # `doc_in_current_and_subclasses`.
-        if hasattr(obj, _DOC_IN_CURRENT_AND_SUBCLASSES):
-            return False
-
-    # for each parent class
-    parent_classes = getattr(cls, "__mro__", [])[1:]
-    for parent in parent_classes:
-        obj = getattr(parent, name, None)
-
-        if obj is None:
+    # Walk the `__mro__` once, probing each class's `__dict__` directly
+    # instead of resolving the attribute again per parent with `getattr`
+    # (which re-walks the tail of the MRO every time).
+    mro = getattr(cls, "__mro__", None) or (cls,)
+
+    seen_definition = False
+    for base in mro:
+        raw = base.__dict__.get(name)
+        if raw is None:
             continue
-
-        obj = _unwrap_func(obj)
-
-        if hasattr(obj, _DOC_IN_CURRENT_AND_SUBCLASSES):
-            return False
-
-        # Skip if the parent's definition is decorated with `do_not_doc_inheritable`
-        # or `for_subclass_implementers`
-        if hasattr(obj, _DO_NOT_DOC_INHERITABLE):
-            return True
-
-        if hasattr(obj, _FOR_SUBCLASS_IMPLEMENTERS):
-            return True
+        obj = _unwrap_func(raw)
+        flags = _get_flags(obj)
+
+        if not seen_definition:
+            seen_definition = True
+            # This is the definition that standard lookup would find.
+            if isinstance(raw, types.DynamicClassAttribute):
+                # e.g. enum's `name`/`value`: `getattr` on the class
+                # itself raises for these in python3.
+                if name in ("name", "value"):
+                    return True
+            # Skip if decorated with `do_not_generate_docs` or
+            # `do_not_doc_inheritable`.
+            if should_skip(obj):
+                return True
+            if base is cls:
+                # Defined in *this* class: don't skip if decorated with
+                # `for_subclass_implementers` or
+                # `doc_in_current_and_subclasses`.
+                if flags & (
+                    FLAG_FOR_SUBCLASS_IMPLEMENTERS | FLAG_DOC_IN_CURRENT_AND_SUBCLASSES
+                ):
+                    return False
+                continue
+            # Defined in a parent; fall through to the parent checks.
+
+        if base is not cls:
+            if flags & FLAG_DOC_IN_CURRENT_AND_SUBCLASSES:
+                return False
+
+            # Skip if the parent's definition is decorated with
+            # `do_not_doc_inheritable` or `for_subclass_implementers`
+            if flags & (FLAG_DO_NOT_DOC_INHERITABLE | FLAG_FOR_SUBCLASS_IMPLEMENTERS):
+                return True
 
     # No blockng decorators --> don't skip
     return False
@@ -501,13 +506,7 @@ def decorate_all_class_attributes(decorator, cls, skip: Iterable[str]):
             continue
 
         # Otherwise, exclude from documentation.
-        if isinstance(obj, property):
-            obj = obj.fget
-
-        if isinstance(obj, (staticmethod, classmethod)):
-            obj = obj.__func__
-
         try:
-            decorator(obj)
+            decorator(_unwrap_func(obj))
         except AttributeError:
             pass
@@ -1,5 +1,7 @@
 """Generate tensorflow.org style API Reference docs for a Python module."""
 
+import concurrent.futures
+import filecmp
 import os
 import pathlib
 import re
@@ -8,9 +10,6 @@ import tempfile
 
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
 
-import mistune
-from mistune.renderers.markdown import MarkdownRenderer
-
 from docugen import doc_generator_visitor
 from docugen import parser
 from docugen import pretty_docs
@@ -18,22 +17,79 @@ from docugen import public_api
 from docugen import traverse
 
 
-EXCLUDED = {"__init__.py", "OWNERS", "README.txt"}
+EXCLUDED = frozenset({"__init__.py", "OWNERS", "README.txt"})
+
+# Characters that break Docusaurus and/or artifacts of the markdown
+# convert, mapped to their desired output.
+DOCUSAURUS_SUBSTITUTIONS: Dict[str, str] = {
+    "\_": "_",
+    "\*": "*",
+    "\*\*": "**",
+    "&quot;": '"',
+}
+
+# Regular expression matching the substitution keys, compiled once. The
+# alternatives are ordered longest first so that e.g. `\*\*` is matched
+# as one key rather than as two `\*` keys.
+_DOCUSAURUS_RE = re.compile(
+    "(%s)"
+    % "|".join(
+        re.escape(key)
+        for key in sorted(DOCUSAURUS_SUBSTITUTIONS, key=len, reverse=True)
+    )
+)
+
+
+def _move_if_changed(work_path: pathlib.Path, out_path: pathlib.Path):
+    """Moves `work_path` over `out_path` unless the contents already match.
+
+    The work tree lives on the same filesystem as the output, so the move
+    is an O(1) rename rather than a byte copy.
+    """
+    if not out_path.exists() or not filecmp.cmp(work_path, out_path, shallow=False):
+        os.replace(work_path, out_path)
+
+
+def _sync_tree(work_dir: pathlib.Path, out_dir: pathlib.Path):
+    """Mirrors `work_dir` into `out_dir`, touching only entries that changed.
+
+    Stale entries are removed, new and changed files are renamed into
+    place, and unchanged files are left as they are so their timestamps
+    survive and downstream tooling does not treat the whole tree as new
+    on every run. A directory with no existing counterpart is moved with
+    a single rename.
+    """
+    if not out_dir.exists():
+        os.rename(work_dir, out_dir)
+        return
+    work_entries = {entry.name: entry for entry in work_dir.iterdir()}
+
+    # Drop anything that is no longer generated, or whose kind changed.
+    for out_entry in out_dir.iterdir():
+        work_entry = work_entries.get(out_entry.name)
+        if work_entry is None or work_entry.is_dir() != out_entry.is_dir():
+            if out_entry.is_dir():
+                shutil.rmtree(out_entry)
+            else:
+                out_entry.unlink()
+
+    for name, work_entry in work_entries.items():
+        out_entry = out_dir / name
+        if work_entry.is_dir():
+            _sync_tree(work_entry, out_entry)
+        else:
+            _move_if_changed(work_entry, out_entry)
 
 
-def multiple_replace(text: str, dictionary: Dict[str, str]) -> str:
+def multiple_replace(text: str) -> str:
     """
-    Checks characters defined in dictionary and replaces them with desired output.
+    Checks characters defined in DOCUSAURUS_SUBSTITUTIONS and replaces them
+    with desired output.
     Args:
         text (str): A string that contains markdown content.
-        dictionary (dict): A dictionary with key-value pairs
-            {current_string : desired_string}
     """
-    # Create a regular expression  from the dictionary keys
-    regex = re.compile("(%s)" % "|".join(map(re.escape, dictionary.keys())))
-
-    # For each match, look-up corresponding value in dictionary
-    return regex.sub(lambda mo: dictionary[mo.string[mo.start() : mo.end()]], text)
+    # For each match, look-up the corresponding value in the table
+    return _DOCUSAURUS_RE.sub(lambda mo: DOCUSAURUS_SUBSTITUTIONS[mo.group(0)], text)
 
 
 class DocGenerator:
@@ -151,7 +207,10 @@ class DocGenerator:
         Args:
           output_dir: Where to write the resulting docs.
         """
-        workdir = pathlib.Path(tempfile.mkdtemp())
+        # Generate into a sibling of `output_dir` so it sits on the same
+        # filesystem and the finished pages can be renamed into place
+        # instead of copied byte-by-byte.
+        workdir = pathlib.Path(tempfile.mkdtemp(dir=os.path.dirname(output_dir) or "."))
 
         # Extract the python api from the _py_modules
         visitor = self.run_extraction()
@@ -179,20 +238,26 @@ class DocGenerator:
         #    index.md
         #    {short_name}.md
         #
-        # Copy the top level files to the `{output_dir}/`, delete and replace the
-        # `{output_dir}/{short_name}/` directory.
+        # Move the top level files to the `{output_dir}/` and mirror the
+        # `{output_dir}/{short_name}/` directory, leaving files whose
+        # content did not change untouched instead of rewriting the whole
+        # tree on every build.
 
         glob_pattern = "*"
 
+        out_root = pathlib.Path(output_dir)
         for work_path in work_py_dir.glob(glob_pattern):
-            out_path = pathlib.Path(output_dir) / work_path.name
+            out_path = out_root / work_path.name
             out_path.parent.mkdir(exist_ok=True, parents=True)
 
             if work_path.is_file():
-                shutil.copy2(work_path, out_path)
+                _move_if_changed(work_path, out_path)
             elif work_path.is_dir():
-                shutil.rmtree(out_path, ignore_errors=True)
-                shutil.copytree(work_path, out_path)
+                _sync_tree(work_path, out_path)
+
+        # Whatever was not consumed by the renames (files that matched the
+        # previous build) is scratch; don't leave it next to the output.
+        shutil.rmtree(workdir, ignore_errors=True)
 
     def write_docs(
         self,
@@ -230,19 +295,26 @@ class DocGenerator:
             )
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Parse and write Markdown pages, resolving cross-links (`tf.symbol`).
-        for full_name in sorted(parser_config.index.keys(), key=lambda k: k.lower()):
-            py_object = parser_config.index[full_name]
-
-            if full_name in parser_config.duplicate_of:
-                continue
-
-            # Methods constants are documented only as part of their parent's page.
-            if parser_config.reference_resolver.is_fragment(full_name):
-                continue
-
-            # Remove the extension from the path.
-            docpath, _ = os.path.splitext(parser.documentation_path(full_name))
+        # Parse the pages serially (the parser shares state through
+        # `parser_config`), resolving cross-links (`tf.symbol`).
+        # Hoist the attribute chains out of the loop; they are invariant
+        # over the whole run, and the loop body only needs the names that
+        # actually get their own page.
+        index = parser_config.index
+        duplicate_of = parser_config.duplicate_of
+        is_fragment = parser_config.reference_resolver.is_fragment
+        to_process = [
+            full_name
+            for full_name in sorted(index, key=str.casefold)
+            if full_name not in duplicate_of
+            # Methods and constants are documented only as part of their
+            # parent's page.
+            and not is_fragment(full_name)
+        ]
+
+        page_tasks = []
+        for full_name in to_process:
+            py_object = index[full_name]
 
             # Generate docs for `py_object`, resolving references.
             try:
@@ -255,38 +327,40 @@ class DocGenerator:
                 raise ValueError(f"Failed to generate docs for symbol: `{full_name}`")
 
             path = output_dir / parser.documentation_path(full_name)
+            page_tasks.append((full_name, path, page_info))
 
-            content = []
-            content.append(pretty_docs.build_md_page(page_info))
-
-            # Clean up markdown and remove characters that break Docusuarus
-            dictionary = {
-                "\_": "_",
-                "\*": "*",
-                "\*\*": "**",
-                "&quot;": '"',
-            }
+        # Rendering is pure string work and the writes are I/O bound, so
+        # fan the pages out over a thread pool. Directories are created
+        # once each; most pages share a parent, so remember the ones that
+        # already exist instead of issuing a mkdir per page.
+        created_dirs = set()
 
-            markdown_renderer = mistune.create_markdown(renderer=MarkdownRenderer())
+        def render_and_write(task):
+            full_name, path, page_info = task
 
-            markdown_content = markdown_renderer("\n".join(content))
-
-            # Remove undesirable characters and/or clean artifacts from markdown convert
-            text = multiple_replace(markdown_content, dictionary)
+            # The pages come out of pretty_docs as markdown already; no
+            # need to parse and re-serialize them through a markdown
+            # library just to apply the character substitutions.
+            text = multiple_replace(pretty_docs.build_md_page(page_info))
 
             try:
-                path.parent.mkdir(exist_ok=True, parents=True)
-                path.write_text(text, encoding="utf-8")
+                parent = path.parent
+                if parent not in created_dirs:
+                    parent.mkdir(exist_ok=True, parents=True)
+                    created_dirs.add(parent)
+                # Encode once and write the bytes directly, skipping the
+                # text-wrapper layer.
+                with open(path, "wb") as f:
+                    f.write(text.encode("utf-8"))
             except OSError:
                 raise OSError(
                     "Cannot write documentation for " f"{full_name} to {path.parent}"
                 )
 
-            duplicates = parser_config.duplicates.get(full_name, [])
-            if not duplicates:
-                continue
-
-            duplicates = [item for item in duplicates if item != full_name]
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            # Consume the iterator so worker exceptions surface here.
+            for _ in executor.map(render_and_write, page_tasks):
+                pass
 
     def extract(
         self,
@@ -334,8 +408,9 @@ class DocGenerator:
 
         # The objects found during traversal, and their children are passed to each
         # of these visitors in sequence. Each visitor returns the list of children
-        # to be passed to the next visitor.
-        visitors = [api_filter, public_api.ignore_typing] + callbacks + [accumulator]
+        # to be passed to the next visitor. `PublicAPIFilter` drops `typing`
+        # members itself, so a separate `ignore_typing` pass is not needed.
+        visitors = [api_filter] + callbacks + [accumulator]
 
         traverse.traverse(py_module, visitors, short_name)
 
@@ -3,8 +3,10 @@
 import ast
 import collections
 import enum
+import functools
 import html
 import inspect
+import linecache
 import os
 import re
 import textwrap
@@ -12,22 +14,24 @@ import typing
 
 from typing import Any, Dict, List, Tuple, Iterable, NamedTuple, Optional, Union
 
-import astor
-import dataclasses
 
 from docugen import doc_controls
 from docugen import doc_generator_visitor
 from docugen import public_api
 
 
-class ObjType(enum.Enum):
-    """Enum to standardize object type checks."""
+class ObjType(enum.IntEnum):
+    """Enum to standardize object type checks.
 
-    MODULE = "module"
-    CLASS = "class"
-    CALLABLE = "callable"
-    PROPERTY = "property"
-    OTHER = "other"
+    An `IntEnum` so comparisons in the per-symbol hot paths are plain
+    integer compares instead of `Enum.__eq__` dispatches.
+    """
+
+    MODULE = 1
+    CLASS = 2
+    CALLABLE = 3
+    PROPERTY = 4
+    OTHER = 5
 
 
 def get_obj_type(py_obj: Any) -> ObjType:
@@ -83,11 +87,33 @@ class ParserConfig(object):
         self.index = index
         self.base_dir = base_dir
         self.code_url_prefix = code_url_prefix
+        # Formatted "other member" descriptions keyed by id(type(obj));
+        # modules full of constants repeat the same few types.
+        self._type_description_cache = {}
+        self._base_dir_index = None
 
     def py_name_to_object(self, full_name):
         """Return the Python object for a Python symbol name."""
         return self.index[full_name]
 
+    def base_dir_index(self):
+        """Returns `(absolute base_dir + sep, code_url_prefix)` pairs.
+
+        Built lazily, once: `_get_defined_in` matches every object's
+        source file against the base dirs, and a string-prefix probe
+        against this index replaces an `os.path.relpath` per pair per
+        object. Sorted longest first so the most specific dir wins.
+        """
+        index = self._base_dir_index
+        if index is None:
+            index = [
+                (os.path.join(os.path.abspath(base_dir), ""), prefix)
+                for base_dir, prefix in zip(self.base_dir, self.code_url_prefix)
+            ]
+            index.sort(key=lambda entry: len(entry[0]), reverse=True)
+            self._base_dir_index = index
+        return index
+
 
 class _FileLocation(object):
     """This class indicates that the object is defined in a regular file.
@@ -131,9 +157,14 @@ class DocsError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=None)
 def documentation_path(full_name, is_fragment=False):
     """Returns the file path for the documentation for the given API symbol.
 
+    The result is cached: reference resolution asks for the path of the
+    same symbols over and over, and the argument space is bounded by the
+    number of public symbols.
+
     Given the fully qualified name of a library symbol, compute the path to which
     to write the documentation for that symbol (relative to a base directory).
     Documentation files are organized into directories that mirror the python
@@ -152,7 +183,9 @@ def documentation_path(full_name, is_fragment=False):
     if is_fragment:
         parts, fragment = parts[:-1], parts[-1]
 
-    result = os.path.join(*parts) + ".md"
+    # Documentation paths are URL-like; join on "/" directly instead of
+    # dispatching through os.path.join.
+    result = "/".join(parts) + ".md"
 
     if is_fragment:
         result = result + "#" + fragment
@@ -160,9 +193,19 @@ def documentation_path(full_name, is_fragment=False):
     return result
 
 
+# Processed docstrings keyed by object id. Objects can't be assumed
+# hashable, so the cache keys on `id()` and stores the object itself
+# alongside the result to keep the id from being reused, verified with
+# `is` on lookup.
+_RAW_DOCSTRING_CACHE: Dict[int, Tuple[Any, str]] = {}
+
+
 def _get_raw_docstring(py_object):
     """Get the docs for a given python object.
 
+    The same object is processed repeatedly when it has aliases or is
+    referenced from other pages, so the processed result is cached.
+
     Args:
       py_object: A python object to retrieve the docs for (class, function/method,
         or module).
@@ -170,16 +213,20 @@ def _get_raw_docstring(py_object):
     Returns:
       The docstring, or the empty string if no docstring was found.
     """
+    cached = _RAW_DOCSTRING_CACHE.get(id(py_object))
+    if cached is not None and cached[0] is py_object:
+        return cached[1]
 
     if get_obj_type(py_object) is not ObjType.OTHER:
         result = inspect.getdoc(py_object) or ""
     else:
         result = ""
 
-    result = _StripTODOs()(result)
-    result = _StripPylintAndPyformat()(result)
-    result = _AddDoctestFences()(result + "\n")
-    result = _DowngradeH1Keywords()(result)
+    result = _STRIP_TODOS_AND_DIRECTIVES(result)
+    result = _ADD_DOCTEST_FENCES(result + "\n")
+    result = _DOWNGRADE_H1_KEYWORDS(result)
+
+    _RAW_DOCSTRING_CACHE[id(py_object)] = (py_object, result)
     return result
 
 
@@ -205,15 +252,12 @@ class _AddDoctestFences(object):
         return self.CARET_BLOCK_RE.sub(self._sub, content)
 
 
-class _StripTODOs(object):
-    TODO_RE = re.compile("#? *TODO.*")
-
-    def __call__(self, content: str) -> str:
-        return self.TODO_RE.sub("", content)
-
+class _StripTODOsAndDirectives(object):
+    """Strips TODO comments and pylint/pyformat directives in one pass."""
 
-class _StripPylintAndPyformat(object):
-    STRIP_RE = re.compile("# *?(pylint|pyformat):.*", re.I)
+    # TODO is matched case-sensitively; the pylint/pyformat directives are
+    # not (scoped with an inline flag so TODO keeps its old behavior).
+    STRIP_RE = re.compile("#? *TODO.*|# *(?i:pylint|pyformat):.*")
 
     def __call__(self, content: str) -> str:
         return self.STRIP_RE.sub("", content)
@@ -225,29 +269,51 @@ class _DowngradeH1Keywords:
     KEYWORD_H1_RE = re.compile(
         r"""
     ^                 # Start of line
-    (?P<indent>\s*)   # Capture leading whitespace as <indent
-    \#\s*             # A literal "#" and more spaces
+    (?P<indent>[ \t]*)  # Capture leading whitespace as <indent
+    \#[ \t]*          # A literal "#" and more spaces
                       # Capture any of these keywords as <keyword>
     (?P<keyword>Args|Arguments|Returns|Raises|Yields|Examples?|Notes?)
-    \s*:?             # Optional whitespace and optional ":"
+    [ \t]*:?          # Optional whitespace and optional ":"
     """,
-        re.VERBOSE,
+        re.VERBOSE | re.MULTILINE,
     )
 
+    # The opening of a code-fence line (the rest of the line is left in
+    # the following segment, where the line-anchored keyword pattern can
+    # never match it).
+    CODE_FENCE_RE = re.compile(r"^[ \t]*```", re.MULTILINE)
+
     def __call__(self, docstring):
-        lines = docstring.splitlines()
+        # Most docstrings have no "#" at all; skip the scan for them.
+        if "#" not in docstring:
+            return docstring
 
-        new_lines = []
+        # Toggle at each code-fence line and substitute only in the
+        # segments outside fences, rather than walking line by line.
+        parts = []
+        pos = 0
         is_code = False
-        for line in lines:
-            if line.strip().startswith("```"):
-                is_code = not is_code
-            elif not is_code:
-                line = self.KEYWORD_H1_RE.sub(r"\g<indent>\g<keyword>:", line)
-            new_lines.append(line)
+        sub = self.KEYWORD_H1_RE.sub
+        for fence in self.CODE_FENCE_RE.finditer(docstring):
+            segment = docstring[pos : fence.start()]
+            parts.append(
+                segment if is_code else sub(r"\g<indent>\g<keyword>:", segment)
+            )
+            parts.append(fence.group(0))
+            pos = fence.end()
+            is_code = not is_code
+
+        segment = docstring[pos:]
+        parts.append(segment if is_code else sub(r"\g<indent>\g<keyword>:", segment))
 
-        docstring = "\n".join(new_lines)
-        return docstring
+        return "".join(parts)
+
+
+# The docstring processors are stateless (their regexes are class
+# attributes), so one shared instance each is enough.
+_STRIP_TODOS_AND_DIRECTIVES = _StripTODOsAndDirectives()
+_ADD_DOCTEST_FENCES = _AddDoctestFences()
+_DOWNGRADE_H1_KEYWORDS = _DowngradeH1Keywords()
 
 
 class IgnoreLineInBlock(object):
@@ -290,9 +356,9 @@ class IgnoreLineInBlock(object):
 # match.group('brackets')
 AUTO_REFERENCE_RE = re.compile(
     r"""
-    (?P<brackets>\[.*?\])                    # find characters inside '[]'
+    (?P<brackets>\[.*?\])           # find characters inside '[]'
     |
-    `(?P<backticks>[\w\(\[\)\]\{\}.,=\s\*\?\#]+?)` # find characters inside '``'
+    `(?P<backticks>[^`\n]+)`        # find characters inside '``'
     """,
     flags=re.VERBOSE,
 )
@@ -323,10 +389,17 @@ class ReferenceResolver(object):
         """
         self._duplicate_of = duplicate_of
         self._is_fragment = is_fragment
+        # Pre-bound for per-function probes (`FormatArguments` creates
+        # one instance per documented function).
+        self._is_fragment_get = is_fragment.get
+        # Resolved links keyed by `(full_name, relative_path)`; sibling
+        # pages in one directory re-resolve the same references.
+        self._reference_to_url_cache = {}
         self._py_module_names = py_module_names
         self._site_link = site_link
 
-        self._all_names = set(is_fragment.keys())
+        # `_is_fragment` has a key per known symbol, so it doubles as the
+        # name index; no separate set copy is needed.
         self._partial_symbols_dict = self._create_partial_symbols_dict()
 
     @classmethod
@@ -341,15 +414,13 @@ class ReferenceResolver(object):
           an instance of `ReferenceResolver` ()
         """
         is_fragment = {}
-        for full_name, obj in visitor.index.items():
+        index = visitor.index
+        for full_name, obj in index.items():
             obj_type = get_obj_type(obj)
-            if obj_type in (ObjType.CLASS, ObjType.MODULE):
+            if obj_type is ObjType.CLASS or obj_type is ObjType.MODULE:
                 is_fragment[full_name] = False
-            elif obj_type in (ObjType.CALLABLE,):
-                if is_class_attr(full_name, visitor.index):
-                    is_fragment[full_name] = True
-                else:
-                    is_fragment[full_name] = False
+            elif obj_type is ObjType.CALLABLE:
+                is_fragment[full_name] = is_class_attr(full_name, index)
             else:
                 is_fragment[full_name] = True
 
@@ -376,10 +447,12 @@ class ReferenceResolver(object):
         Returns:
           A list of partial symbol names
         """
-
-        split_symbol = symbol.split(".")
-        partials = [".".join(split_symbol[i:]) for i in range(1, len(split_symbol) - 1)]
-        return partials
+        # Each partial is a suffix of `symbol`, so slice at the dot
+        # positions instead of splitting and re-joining the tail for
+        # every starting point. The last dot is excluded so every partial
+        # keeps at least one '.'.
+        dots = [i for i, char in enumerate(symbol) if char == "."]
+        return [symbol[i + 1 :] for i in dots[:-1]]
 
     def _create_partial_symbols_dict(self):
         """Creates a partial symbols dictionary for all the symbols in TensorFlow.
@@ -387,31 +460,29 @@ class ReferenceResolver(object):
         Returns:
           A dictionary mapping {partial_symbol: real_symbol}
         """
-        partial_symbols_dict = collections.defaultdict(list)
-
-        for name in sorted(self._all_names):
-            if "tf.compat.v" in name or "tf.contrib" in name:
-                continue
-            # TODO(yashkatariya): Remove `tf.experimental.numpy` after `tf.numpy` is
-            # in not in experimental namespace.
-            if "tf.experimental.numpy" in name or "tf.numpy" in name:
-                continue
-            partials = self._partial_symbols(name)
-            for partial in partials:
-                partial_symbols_dict[partial].append(name)
+        # TODO(yashkatariya): Remove `tf.experimental.numpy` after `tf.numpy` is
+        # in not in experimental namespace.
+        skip_substrings = (
+            "tf.compat.v",
+            "tf.contrib",
+            "tf.experimental.numpy",
+            "tf.numpy",
+        )
 
-        new_partial_dict = {}
-        for partial, full_names in partial_symbols_dict.items():
-            if not full_names:
+        # Only the first (sorted) name per partial survives, so fill the
+        # dict directly instead of accumulating every candidate in a
+        # defaultdict(list) and taking element zero in a second pass. The
+        # sort stays: it decides which name wins a contested partial.
+        partial_symbols_dict = {}
+        duplicate_of = self._duplicate_of
+        for name in sorted(self._is_fragment):
+            if any(substring in name for substring in skip_substrings):
                 continue
+            for partial in self._partial_symbols(name):
+                if partial not in partial_symbols_dict:
+                    partial_symbols_dict[partial] = duplicate_of.get(name, name)
 
-            full_names = [
-                self._duplicate_of.get(full_name, full_name) for full_name in full_names
-            ]
-
-            new_partial_dict[partial] = full_names[0]
-
-        return new_partial_dict
+        return partial_symbols_dict
 
     def replace_backticks(self, string):
         """Replace `backticks` with <code>HTML</code>.
@@ -423,18 +494,10 @@ class ReferenceResolver(object):
           `string`, in which <code> </code> appears instead
         """
 
-        def replace(match):
-            return self._replace(match)
-
-        fixed_lines = []
-        filters = []
-
-        for line in string.splitlines():
-            if not any(filter_block(line) for filter_block in filters):
-                line = re.sub(AUTO_REFERENCE_RE, replace, line)
-            fixed_lines.append(line)
-
-        return "\n".join(fixed_lines)
+        # The pattern has no anchors, so one pass over the whole string
+        # is equivalent to running it line by line — without the
+        # splitlines/join round trip and the per-line dispatch.
+        return AUTO_REFERENCE_RE.sub(self._replace, string)
 
     def py_main_name(self, full_name):
         """Return the main name for a Python symbol name."""
@@ -464,6 +527,11 @@ class ReferenceResolver(object):
         Raises:
           DocsError: If the symbol is not found.
         """
+        cache_key = (ref_full_name, relative_path_to_root)
+        cached = self._reference_to_url_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         if self._is_fragment.get(ref_full_name, False):
             # methods and constants get duplicated. And that's okay.
             # Use the main name of their parent.
@@ -474,11 +542,13 @@ class ReferenceResolver(object):
             main_name = self._duplicate_of.get(ref_full_name, ref_full_name)
 
         # Check whether this link exists
-        if main_name not in self._all_names:
+        if main_name not in self._is_fragment:
             raise DocsError(f"Cannot make link to {main_name!r}: Not in index.")
 
         ref_path = documentation_path(main_name, self._is_fragment[main_name])
-        return os.path.join(relative_path_to_root, ref_path)
+        url = os.path.join(relative_path_to_root, ref_path)
+        self._reference_to_url_cache[cache_key] = url
+        return url
 
     def _replace(self, match):
         """Convert a backtick-enclosed string into HTML form."""
@@ -496,6 +566,18 @@ class ReferenceResolver(object):
         return match.group(0)
 
 
+def _dedent_block(content: str) -> str:
+    """`textwrap.dedent`, skipping the full scan when nothing is indented."""
+    if (
+        not content.startswith((" ", "\t"))
+        and "\n " not in content
+        and "\n\t" not in content
+    ):
+        # No line starts with whitespace, so dedenting is a no-op.
+        return content
+    return textwrap.dedent(content)
+
+
 def _pairs(items):
     """Given an list of items [a,b,a,b...], generate pairs [(a,b),(a,b)...].
 
@@ -506,7 +588,10 @@ def _pairs(items):
       A list of pairs.
     """
     assert len(items) % 2 == 0
-    return list(zip(items[::2], items[1::2]))
+    # Pair consecutive elements off one iterator instead of allocating
+    # the two stride-2 slice copies.
+    it = iter(items)
+    return list(zip(it, it))
 
 
 # Don't change the width="214px" without consulting with the devsite-team.
@@ -637,18 +722,23 @@ class TitleBlock(object):
 
         return "".join(sub)
 
-    # This regex matches an entire title-block.
-    BLOCK_RE = re.compile(
-        r"""
-      (?:^|^\n|\n\n)                  # After a blank line (non-capturing):
+    # The title/content body of a title-block. A block may start right
+    # where the previous one ended (optionally after a single newline),
+    # or anywhere after a blank line; the two patterns below pair this
+    # body with those two prefixes so `split_string` walks the docstring
+    # in one pass instead of re-splitting the remainder per block.
+    _BLOCK_BODY = r"""
         (?P<title>[A-Z][\s\w]{0,20})  # Find a sentence case title, followed by
           \s*:\s*?(?=\n)              # whitespace, a colon and a new line.
       (?P<content>.*?)                # Then take everything until
         (?=\n\S|$)                    # look ahead finds a non-indented line
                                       # (a new-line followed by non-whitespace)
-    """,
-        re.VERBOSE | re.DOTALL,
-    )
+    """
+
+    # Matches a block at the current position (used with `.match(s, pos)`).
+    _BLOCK_START_RE = re.compile(r"\n?" + _BLOCK_BODY, re.VERBOSE | re.DOTALL)
+    # Matches a block after a blank line (used with `.search(s, pos)`).
+    _BLOCK_MID_RE = re.compile(r"\n\n" + _BLOCK_BODY, re.VERBOSE | re.DOTALL)
 
     # This
     ITEM_RE = re.compile(
@@ -700,30 +790,36 @@ class TitleBlock(object):
           `str` is called on it (each chunk is a python `str`, or a `TitleBlock`).
         """
         parts = []
-        while docstring:
-            split = re.split(cls.BLOCK_RE, docstring, maxsplit=1)
-            # The first chunk in split is all text before the TitleBlock.
-            before = split.pop(0)
-            parts.append(before)
-
-            # If `split` is empty, there were no other matches, and we're done.
-            if not split:
+        pos = 0
+        while True:
+            # A block directly at `pos` takes precedence; otherwise find
+            # the next one introduced by a blank line.
+            match = cls._BLOCK_START_RE.match(
+                docstring, pos
+            ) or cls._BLOCK_MID_RE.search(docstring, pos)
+
+            # If there is no match, the rest of `docstring` is plain text.
+            if match is None:
                 break
 
-            # If there was a match,  split contains three items. The two capturing
-            # groups in the RE, and the remainder.
-            title, content, docstring = split
+            # Everything before the TitleBlock is kept as a text chunk.
+            parts.append(docstring[pos : match.start()])
 
             # Now `content` contains the text and the name-value item pairs.
             # separate these two parts.
-            content = textwrap.dedent(content)
+            content = _dedent_block(match.group("content"))
             split = cls.ITEM_RE.split(content)
             text = split.pop(0)
             items = _pairs(split)
 
-            title_block = cls(title=title, text=text, items=items)
+            title_block = cls(title=match.group("title"), text=text, items=items)
             parts.append(title_block)
 
+            pos = match.end()
+
+        if pos < len(docstring):
+            parts.append(docstring[pos:])
+
         return parts
 
 
@@ -740,14 +836,39 @@ def _get_other_member_doc(
     if doc_generator_visitor.maybe_singleton(obj):
         description = f"`{repr(obj)}`"
     else:
-        class_name = parser_config.reverse_index.get(id(type(obj)), None)
-        if class_name is not None:
-            description = f"`{class_name}`"
-        else:
-            description = ""
+        cache = parser_config._type_description_cache
+        type_id = id(type(obj))
+        description = cache.get(type_id)
+        if description is None:
+            class_name = parser_config.reverse_index.get(type_id, None)
+            if class_name is not None:
+                description = f"`{class_name}`"
+            else:
+                description = ""
+            cache[type_id] = description
     return description
 
 
+@functools.lru_cache(maxsize=None)
+def _relative_path_for(full_name: str) -> str:
+    """Relative path from `full_name`'s doc page back to the doc root.
+
+    Cached per name: every page and every member parse recomputes the
+    same value, and names at the same depth are plentiful.
+    """
+    return os.path.relpath(
+        path=".", start=os.path.dirname(documentation_path(full_name)) or "."
+    )
+
+
+# Parsed docstrings keyed by `(id(py_object), id(parser_config))`, the
+# object kept alive in the entry as in the other id caches. Aliased and
+# re-exported objects are parsed once instead of once per reachable
+# path. The `relative_path_to_root`/`full_name` arguments don't
+# influence the parse, so they stay out of the key.
+_MD_DOCSTRING_CACHE: Dict[Tuple[int, int], Tuple[Any, "_DocstringInfo"]] = {}
+
+
 def _parse_md_docstring(
     py_object: Any,
     relative_path_to_root: str,
@@ -758,6 +879,10 @@ def _parse_md_docstring(
 
     This function replaces `` references with markdown links.
 
+    The result is cached per `(py_object, parser_config)` pair; each
+    call returns a fresh `docstring_parts` list, since callers (notably
+    `_augment_attributes`) mutate it.
+
     For links within the same set of docs, the `relative_path_to_root` for a
     docstring on the page for `full_name` can be set to:
 
@@ -781,6 +906,12 @@ def _parse_md_docstring(
       A _DocstringInfo object, all fields will be empty if no docstring was found.
     """
 
+    cache_key = (id(py_object), id(parser_config))
+    cached = _MD_DOCSTRING_CACHE.get(cache_key)
+    if cached is not None and cached[0] is py_object:
+        info = cached[1]
+        return _DocstringInfo(info.brief, list(info.docstring_parts))
+
     if get_obj_type(py_object) is ObjType.OTHER:
         raw_docstring = _get_other_member_doc(
             obj=py_object,
@@ -801,99 +932,124 @@ def _parse_md_docstring(
 
     docstring_parts = TitleBlock.split_string(docstring)
 
+    # A pristine copy of the parts list goes into the cache.
+    _MD_DOCSTRING_CACHE[cache_key] = (
+        py_object,
+        _DocstringInfo(brief, list(docstring_parts)),
+    )
     return _DocstringInfo(brief, docstring_parts)
 
 
-class TypeAnnotationExtractor(ast.NodeVisitor):
-    """Extracts the type annotations by parsing the AST of a function."""
+# `ast.unparse` (3.9+) is considerably faster than the astor package
+# this module used to depend on, and leaves no trailing newline to strip.
+_unparse = ast.unparse
+
+
+class _FuncSourceVisitor(ast.NodeVisitor):
+    """Extracts annotations, defaults and decorators in one AST pass.
+
+    One tree descent replaces the former separate type-annotation,
+    default-value and decorator visitors, which each re-walked the same
+    parsed source per function.
+    """
+
+    # Escapes the single-character substitutions in one translate pass.
+    _ESCAPE_TABLE = str.maketrans({"\t": "\\t", "\n": "\\n"})
 
     def __init__(self):
         self.annotation_dict = {}
         self.arguments_typehint_exists = False
         self.return_typehint_exists = False
+        # Class-body `AnnAssign` annotations, used for dataclasses.
+        self.dataclass_annotation_dict = {}
+        self.dataclass_typehint_exists = False
+        self.ast_args_defaults = []
+        self.ast_kw_only_defaults = []
+        self.decorator_list = []
+
+    def _preprocess_default(self, val) -> str:
+        text_default_val = (
+            _unparse(val).translate(self._ESCAPE_TABLE).replace('"""', "'")
+        )
+        text_default_val = _PAREN_NUMBER_RE.sub("\\1", text_default_val)
+        return text_default_val
 
     def visit_FunctionDef(self, node) -> None:  # pylint: disable=invalid-name
-        """Visits the `FunctionDef` node in AST tree and extracts the typehints."""
+        """Extracts typehints, default values and decorators of a function."""
+        annotation_dict = self.annotation_dict
 
         # Capture the return type annotation.
         if node.returns:
-            self.annotation_dict["return"] = (
-                astor.to_source(node.returns).strip().replace('"""', '"')
-            )
+            annotation_dict["return"] = _unparse(node.returns).replace('"""', '"')
             self.return_typehint_exists = True
 
         # Capture the args type annotation.
         for arg in node.args.args:
             if arg.annotation:
-                self.annotation_dict[arg.arg] = (
-                    astor.to_source(arg.annotation).strip().replace('"""', '"')
-                )
+                annotation_dict[arg.arg] = _unparse(arg.annotation).replace('"""', '"')
                 self.arguments_typehint_exists = True
 
         # Capture the kwarg only args type annotation.
         for kwarg in node.args.kwonlyargs:
             if kwarg.annotation:
-                self.annotation_dict[kwarg.arg] = (
-                    astor.to_source(kwarg.annotation).strip().replace('"""', '"')
+                annotation_dict[kwarg.arg] = _unparse(kwarg.annotation).replace(
+                    '"""', '"'
                 )
                 self.arguments_typehint_exists = True
 
+        for default_val in node.args.defaults:
+            if default_val is not None:
+                self.ast_args_defaults.append(self._preprocess_default(default_val))
 
-class DataclassTypeAnnotationExtractor(ast.NodeVisitor):
-    """Extracts the type annotations by parsing the AST of a dataclass."""
+        for default_val in node.args.kw_defaults:
+            if default_val is not None:
+                self.ast_kw_only_defaults.append(self._preprocess_default(default_val))
 
-    def __init__(self):
-        self.annotation_dict = {}
-        self.arguments_typehint_exists = False
-        self.return_typehint_exists = False
+        for dec in node.decorator_list:
+            self.decorator_list.append(_unparse(dec))
+
+    visit_AsyncFunctionDef = visit_FunctionDef  # pylint: disable=invalid-name
 
     def visit_ClassDef(self, node) -> None:  # pylint: disable=invalid-name
-        # Don't visit all nodes. Only visit top-level AnnAssign nodes so that
-        # If there's an AnnAssign in a method it doesn't get picked up.
+        """Extracts class-body annotations, then descends into the methods."""
+        # Only pick up top-level `AnnAssign` nodes (dataclass fields), so
+        # an `AnnAssign` in a method body isn't mistaken for a field.
         for sub in node.body:
             if isinstance(sub, ast.AnnAssign):
-                self.visit_AnnAssign(sub)
-
-    def visit_AnnAssign(self, node) -> None:  # pylint: disable=invalid-name
-        """Vists an assignment with a type annotation. Dataclasses is an example."""
-        arg = astor.to_source(node.target).strip()
-        anno = astor.to_source(node.annotation).strip()
-        self.annotation_dict[arg] = anno
-        self.arguments_typehint_exists = True
-
+                self.dataclass_annotation_dict[_unparse(sub.target)] = _unparse(
+                    sub.annotation
+                )
+                self.dataclass_typehint_exists = True
+        self.generic_visit(node)
 
-class ASTDefaultValueExtractor(ast.NodeVisitor):
-    """Extracts the default values by parsing the AST of a function."""
 
-    _PAREN_NUMBER_RE = re.compile(r"^\(([0-9.e-]+)\)")
+# Default-value texts repeat heavily across an API surface ("None",
+# "True", "0", ...), and `html.escape` makes five replace passes per
+# call; a bounded cache turns the common cases into a dict hit.
+_escape_cached = functools.lru_cache(maxsize=2048)(html.escape)
 
-    def __init__(self):
-        self.ast_args_defaults = []
-        self.ast_kw_only_defaults = []
+# `inspect.Parameter` constants, bound once: the signature loops below
+# compare against them for every parameter of every documented function.
+_POSITIONAL_ONLY = inspect.Parameter.POSITIONAL_ONLY
+_POSITIONAL_OR_KEYWORD = inspect.Parameter.POSITIONAL_OR_KEYWORD
+_VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+_KEYWORD_ONLY = inspect.Parameter.KEYWORD_ONLY
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+_EMPTY = inspect.Parameter.empty
 
-    def _preprocess(self, val: str) -> str:
-        text_default_val = (
-            astor.to_source(val)
-            .strip()
-            .replace("\t", "\\t")
-            .replace("\n", "\\n")
-            .replace('"""', "'")
-        )
-        text_default_val = self._PAREN_NUMBER_RE.sub("\\1", text_default_val)
-        return text_default_val
+# Regexes shared by the signature-formatting helpers below, compiled
+# once at module load.
+_PAREN_NUMBER_RE = re.compile(r"^\(([0-9.e-]+)\)")
 
-    def visit_FunctionDef(self, node) -> None:  # pylint: disable=invalid-name
-        """Visits the `FunctionDef` node and extracts the default values."""
+_OBJECT_MEMORY_ADDRESS_RE = re.compile(r"<(?P<type>.+) object at 0x[\da-f]+>")
 
-        for default_val in node.args.defaults:
-            if default_val is not None:
-                text_default_val = self._preprocess(default_val)
-                self.ast_args_defaults.append(text_default_val)
+# A regular expression capturing a python identifier.
+_IDENTIFIER_RE = r"[a-zA-Z_]\w*"
 
-        for default_val in node.args.kw_defaults:
-            if default_val is not None:
-                text_default_val = self._preprocess(default_val)
-                self.ast_kw_only_defaults.append(text_default_val)
+# A single dotted name inside a type-annotation string, delimited by
+# brackets, commas, whitespace or the end. No capture groups: `finditer`
+# matches are read with a bare `group()`.
+_INDIVIDUAL_TYPES_RE = re.compile(r"[\w.]+(?=$|[,\s\]\[])")
 
 
 class FormatArguments(object):
@@ -907,30 +1063,37 @@ class FormatArguments(object):
         "saver_pb2.SaverDef": "tf.train.SaverDef",
     }
 
-    _OBJECT_MEMORY_ADDRESS_RE = re.compile(r"<(?P<type>.+) object at 0x[\da-f]+>")
-
-    # A regular expression capturing a python identifier.
-    _IDENTIFIER_RE = r"[a-zA-Z_]\w*"
-
-    _INDIVIDUAL_TYPES_RE = re.compile(
-        r"""
-        (?P<single_type>
-          ([\w.]*)
-          (?=$|,| |\]|\[)
-        )
-      """,
-        re.IGNORECASE | re.VERBOSE,
+    # Distinct dotted depths among the internal names, deepest first, so
+    # a hash probe per depth finds the most specific match.
+    _INTERNAL_NAME_DEPTHS = sorted(
+        {name.count(".") + 1 for name in _INTERNAL_NAMES}, reverse=True
     )
 
+    # A dotted name: an identifier followed by one or more `.identifier`
+    # parts. Compiled once; `_replace_internal_names` runs per kwarg.
+    _FULL_NAME_RE = re.compile(rf"^{_IDENTIFIER_RE}(\.{_IDENTIFIER_RE})+")
+
     _TYPING = frozenset(
         list(typing.__dict__.keys())
         + ["int", "str", "bytes", "float", "complex", "bool", "None"]
     )
 
+    # Names `_get_non_builtin_ast_types` drops: builtins/typing plus the
+    # Ellipsis literal (which `[\w.]+` matches too).
+    _AST_TYPES_SKIP = _TYPING | {"..."}
+
     _IMMUTABLE_TYPES = frozenset(
         [int, str, bytes, float, complex, bool, Ellipsis, type(None), tuple, frozenset]
     )
 
+    # Tested by `id`: equality on these is identity anyway, and an int
+    # probe never raises on unhashable `typing` constructs.
+    _IMMUTABLE_TYPE_IDS = frozenset(map(id, _IMMUTABLE_TYPES))
+
+    # Types whose `repr` is known to be cheap. Anything else (large
+    # containers, user objects) skips the repr comparison below.
+    _CHEAP_REPR_TYPES = (int, float, bool, str, bytes, type(None))
+
     def __init__(
         self,
         type_annotations: Dict[str, str],
@@ -939,20 +1102,23 @@ class FormatArguments(object):
     ) -> None:
         self._type_annotations = type_annotations
         self._reverse_index = parser_config.reverse_index
+        # Bound once: the formatting loops below probe the reverse index
+        # per argument.
+        self._reverse_index_get = self._reverse_index.get
         self._reference_resolver = parser_config.reference_resolver
         # func_full_name is used to calculate the relative path.
         self._func_full_name = func_full_name
 
-        self._is_fragment = self._reference_resolver._is_fragment.get(
-            self._func_full_name, None
-        )
+        self._is_fragment = self._reference_resolver._is_fragment_get(func_full_name)
 
     def _extract_non_builtin_types(
         self, arg_obj: Any, non_builtin_types: List[Any]
     ) -> List[Any]:
         """Extracts the non-builtin types from a type annotations object.
 
-        Recurses if an object contains `__args__` attribute. If an object is
+        Walks into `__args__` of nested generics with an explicit stack
+        (no recursion frames; deep annotations like
+        `Dict[str, List[Tuple[int, ...]]]` are common). If an object is
         an inbuilt object or an `Ellipsis` then its skipped.
 
         Args:
@@ -962,22 +1128,30 @@ class FormatArguments(object):
         Returns:
           List of non-builtin types.
         """
-
-        annotations = getattr(arg_obj, "__args__", [arg_obj])
+        annotations = getattr(arg_obj, "__args__", None)
         if annotations is None:
             annotations = [arg_obj]
 
-        for anno in annotations:
-            if self._reverse_index.get(id(anno), None):
+        reverse_index_get = self._reverse_index_get
+        immutable_type_ids = self._IMMUTABLE_TYPE_IDS
+        typing_ids = public_api.TYPING_IDS
+
+        # Reversed so that popping from the end visits annotations in
+        # source order, matching the recursive traversal.
+        stack = list(annotations)
+        stack.reverse()
+        while stack:
+            anno = stack.pop()
+            if reverse_index_get(id(anno)):
                 non_builtin_types.append(anno)
-            elif (
-                anno in self._IMMUTABLE_TYPES or id(type(anno)) in public_api.TYPING_IDS
-            ):
+            elif id(anno) in immutable_type_ids or id(type(anno)) in typing_ids:
                 continue
-            elif hasattr(anno, "__args__"):
-                self._extract_non_builtin_types(anno, non_builtin_types)
             else:
-                non_builtin_types.append(anno)
+                args = getattr(anno, "__args__", None)
+                if args is None:
+                    non_builtin_types.append(anno)
+                else:
+                    stack.extend(reversed(args))
         return non_builtin_types
 
     def _get_non_builtin_ast_types(self, ast_typehint: str) -> List[str]:
@@ -993,93 +1167,104 @@ class FormatArguments(object):
         """
 
         non_builtin_ast_types = []
-        for single_type, _ in self._INDIVIDUAL_TYPES_RE.findall(ast_typehint):
-            if not single_type or single_type in self._TYPING or single_type == "...":
+        skip = self._AST_TYPES_SKIP
+        for match in _INDIVIDUAL_TYPES_RE.finditer(ast_typehint):
+            single_type = match.group()
+            if single_type in skip:
                 continue
             non_builtin_ast_types.append(single_type)
         return non_builtin_ast_types
 
     def _replace_internal_names(self, default_text: str) -> str:
-        full_name_re = f"^{self._IDENTIFIER_RE}(.{self._IDENTIFIER_RE})+"
-        match = re.match(full_name_re, default_text)
+        match = self._FULL_NAME_RE.match(default_text)
         if match:
-            for internal_name, public_name in self._INTERNAL_NAMES.items():
-                if match.group(0).startswith(internal_name):
+            parts = match.group(0).split(".")
+            for depth in self._INTERNAL_NAME_DEPTHS:
+                internal_name = ".".join(parts[:depth])
+                public_name = self._INTERNAL_NAMES.get(internal_name)
+                if public_name is not None:
                     return public_name + default_text[len(internal_name) :]
         return default_text
 
     def format_return(self, return_anno: Any) -> str:
         return self._type_annotations["return"]
 
-    def format_args(self, args: List[inspect.Parameter]) -> List[str]:
+    def format_args(self, args: List[inspect.Parameter]) -> Iterable[str]:
         """Creates a text representation of the args in a method/function.
 
         Args:
           args: List of args to format.
 
-        Returns:
+        Yields:
           Formatted args with type annotations if they exist.
         """
-
-        args_text_repr = []
+        type_annotations = self._type_annotations
 
         for arg in args:
             arg_name = arg.name
-            if arg_name in self._type_annotations:
-                typeanno = self._type_annotations[arg_name]
-                args_text_repr.append(f"{arg_name}: {typeanno}")
+            typeanno = type_annotations.get(arg_name)
+            if typeanno is not None:
+                yield f"{arg_name}: {typeanno}"
             else:
-                args_text_repr.append(f"{arg_name}")
-
-        return args_text_repr
+                yield arg_name
 
     def format_kwargs(
         self, kwargs: List[inspect.Parameter], ast_defaults: List[str]
-    ) -> List[str]:
+    ) -> Iterable[str]:
         """Creates a text representation of the kwargs in a method/function.
 
         Args:
           kwargs: List of kwargs to format.
           ast_defaults: Default values extracted from the function's AST tree.
 
-        Returns:
+        Yields:
           Formatted kwargs with type annotations if they exist.
         """
-
-        kwargs_text_repr = []
-
         if len(ast_defaults) < len(kwargs):
             ast_defaults.extend([None] * (len(kwargs) - len(ast_defaults)))
 
+        reverse_index_get = self._reverse_index_get
         for kwarg, ast_default in zip(kwargs, ast_defaults):
             kname = kwarg.name
             default_val = kwarg.default
 
-            if id(default_val) in self._reverse_index:
-                default_text = self._reverse_index[id(default_val)]
+            indexed_text = reverse_index_get(id(default_val))
+            if indexed_text is not None:
+                default_text = indexed_text
             elif ast_default is not None:
                 default_text = ast_default
-                if default_text != repr(default_val):
+                # The repr comparison only recognizes plain literals, so
+                # compute it just for types where repr is cheap; other
+                # defaults (whose repr never matches their source text
+                # anyway) go straight to the internal-name rewrite.
+                if not isinstance(
+                    default_val, self._CHEAP_REPR_TYPES
+                ) or default_text != repr(default_val):
                     default_text = self._replace_internal_names(default_text)
             # Kwarg without default value.
-            elif default_val is kwarg.empty:
-                kwargs_text_repr.extend(self.format_args([kwarg]))
+            elif default_val is _EMPTY:
+                yield from self.format_args([kwarg])
                 continue
             else:
                 # Strip object memory addresses to avoid unnecessary doc churn.
-                default_text = self._OBJECT_MEMORY_ADDRESS_RE.sub(
+                default_text = _OBJECT_MEMORY_ADDRESS_RE.sub(
                     r"<\g<type>>", repr(default_val)
                 )
-            default_text = html.escape(str(default_text))
+            default_text = _escape_cached(str(default_text))
 
             # Format the kwargs to add the type annotation and default values.
-            if kname in self._type_annotations:
-                typeanno = self._type_annotations[kname]
-                kwargs_text_repr.append(f"{kname}: {typeanno} = {default_text}")
+            typeanno = self._type_annotations.get(kname)
+            if typeanno is not None:
+                yield f"{kname}: {typeanno} = {default_text}"
             else:
-                kwargs_text_repr.append(f"{kname}={default_text}")
+                yield f"{kname}={default_text}"
+
 
-        return kwargs_text_repr
+# Shared by `_SignatureComponents.__str__`: `textwrap.fill` builds a
+# fresh TextWrapper per call, and one signature is stringified per
+# documented function. Options are the `fill` defaults, so the wrapped
+# output is unchanged.
+_SIGNATURE_WRAPPER = textwrap.TextWrapper(width=80)
 
 
 class _SignatureComponents(NamedTuple):
@@ -1097,7 +1282,7 @@ class _SignatureComponents(NamedTuple):
             # If there is no type annotation on arguments, then wrap the entire
             # signature to width 80.
             if not self.arguments_typehint_exists:
-                str_signature = textwrap.fill(str_signature, width=80)
+                str_signature = _SIGNATURE_WRAPPER.fill(str_signature)
             arguments_signature = (
                 "\n" + textwrap.indent(str_signature, prefix="    ") + "\n"
             )
@@ -1109,6 +1294,102 @@ class _SignatureComponents(NamedTuple):
         return full_signature
 
 
+def _is_dataclass(obj) -> bool:
+    """`dataclasses.is_dataclass` as one isinstance plus one hasattr.
+
+    Same semantics as the stdlib helper (true for dataclass types, their
+    subclasses, and instances), without the module-call overhead on a
+    check made for every documented callable.
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    return hasattr(cls, "__dataclass_fields__")
+
+
+def _format_annotation(annotation: Any) -> str:
+    """Formats a runtime annotation object the way the source spells it."""
+    # String annotations (forward references, or modules using
+    # `from __future__ import annotations`) already are source text.
+    if isinstance(annotation, str):
+        return annotation
+    return inspect.formatannotation(annotation)
+
+
+# Parsed source trees keyed by `id(func)`, kept alive like the other
+# id-keyed caches. `generate_signature` and `extract_decorators` both
+# need the AST of the same function; sharing it halves the source reads
+# and `ast.parse` calls, the dominant per-method cost.
+_FUNC_AST_CACHE: Dict[int, Tuple[Any, Optional[ast.AST]]] = {}
+
+
+def _parse_func_ast(func) -> Optional[ast.AST]:
+    """Parses `func`'s source into an AST, once per function object.
+
+    Returns None when the source is unavailable or unparseable (builtins,
+    dynamically-created functions, ...).
+    """
+    cached = _FUNC_AST_CACHE.get(id(func))
+    if cached is not None and cached[0] is func:
+        return cached[1]
+
+    # C-implemented builtins, partials and other source-less callables
+    # make `getsource` raise every time, and the exception machinery is
+    # far costlier than this check. Anything `getsource` can handle is a
+    # class, carries `__code__`, or wraps something that does.
+    if not (
+        isinstance(func, type)
+        or hasattr(func, "__code__")
+        or hasattr(func, "__wrapped__")
+    ):
+        _FUNC_AST_CACHE[id(func)] = (func, None)
+        return None
+
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except Exception:  # pylint: disable=broad-except
+        # A wide-variety of errors can be thrown here.
+        tree = None
+
+    _FUNC_AST_CACHE[id(func)] = (func, tree)
+    return tree
+
+
+# Fused-visitor results keyed by `id(func)`, kept alive the same way.
+_FUNC_VISITOR_CACHE: Dict[int, Tuple[Any, Optional[_FuncSourceVisitor]]] = {}
+
+
+def _func_source_info(func) -> Optional[_FuncSourceVisitor]:
+    """Runs `_FuncSourceVisitor` over `func`'s source, once per function.
+
+    Returns None when the source is unavailable.
+    """
+    cached = _FUNC_VISITOR_CACHE.get(id(func))
+    if cached is not None and cached[0] is func:
+        return cached[1]
+
+    func_ast = _parse_func_ast(func)
+    if func_ast is None:
+        visitor = None
+    else:
+        visitor = _FuncSourceVisitor()
+        try:
+            visitor.visit(func_ast)
+        except Exception:  # pylint: disable=broad-except
+            # A wide-variety of errors can be thrown here.
+            pass
+
+    _FUNC_VISITOR_CACHE[id(func)] = (func, visitor)
+    return visitor
+
+
+# Signatures keyed by `(id(func), id(parser_config))`. The same function
+# object is seen once per alias and once per subclass that inherits it,
+# and building a signature costs a source read plus an `ast.parse`. The
+# function is stored alongside its components to keep the id alive (and
+# to detect a reused id, as in `_RAW_DOCSTRING_CACHE`); the components
+# are an immutable NamedTuple, so sharing them is safe.
+_SIGNATURE_CACHE: Dict[Tuple[int, int], Tuple[Any, "_SignatureComponents"]] = {}
+
+
 def generate_signature(
     func: Any, parser_config: ParserConfig, func_full_name: str
 ) -> _SignatureComponents:
@@ -1120,6 +1401,9 @@ def generate_signature(
     The returned string is Python code, so if it is included in a Markdown
     document, it should be typeset as code (using backticks), or escaped.
 
+    The result is cached per `(func, parser_config)` pair; it does not
+    depend on `func_full_name`.
+
     Args:
       func: A function, method, or functools.partial to extract the signature for.
       parser_config: `ParserConfig` for the method/function whose signature is
@@ -1129,6 +1413,10 @@ def generate_signature(
     Returns:
       A `_SignatureComponents` NamedTuple.
     """
+    cache_key = (id(func), id(parser_config))
+    cached = _SIGNATURE_CACHE.get(cache_key)
+    if cached is not None and cached[0] is func:
+        return cached[1]
 
     all_args_list = []
 
@@ -1137,29 +1425,50 @@ def generate_signature(
         sig_values = sig.parameters.values()
         return_anno = sig.return_annotation
     except (ValueError, TypeError):
+        sig = None
         sig_values = []
         return_anno = None
 
-    if dataclasses.is_dataclass(func):
-        type_annotation_visitor = DataclassTypeAnnotationExtractor()
+    source_info = _func_source_info(func)
+    if source_info is not None:
+        # Copies: `format_kwargs` pads its defaults list in place.
+        ast_args_defaults = list(source_info.ast_args_defaults)
+        ast_kw_only_defaults = list(source_info.ast_kw_only_defaults)
     else:
-        type_annotation_visitor = TypeAnnotationExtractor()
-
-    ast_defaults_visitor = ASTDefaultValueExtractor()
-
-    try:
-        func_source = textwrap.dedent(inspect.getsource(func))
-        func_ast = ast.parse(func_source)
-        # Extract the type annotation from the parsed ast.
-        type_annotation_visitor.visit(func_ast)
-        ast_defaults_visitor.visit(func_ast)
-    except Exception:  # pylint: disable=broad-except
-        # A wide-variety of errors can be thrown here.
-        pass
-
-    type_annotations = type_annotation_visitor.annotation_dict
-    arguments_typehint_exists = type_annotation_visitor.arguments_typehint_exists
-    return_typehint_exists = type_annotation_visitor.return_typehint_exists
+        ast_args_defaults = []
+        ast_kw_only_defaults = []
+
+    if _is_dataclass(func):
+        # Fields are class-body annotations; the generated `__init__` has
+        # no source to inspect.
+        if source_info is not None:
+            type_annotations = source_info.dataclass_annotation_dict
+            arguments_typehint_exists = source_info.dataclass_typehint_exists
+        else:
+            type_annotations = {}
+            arguments_typehint_exists = False
+        return_typehint_exists = False
+    elif sig is not None:
+        # The signature already carries the annotations; no need to
+        # recover them from the source text.
+        type_annotations = {}
+        arguments_typehint_exists = False
+        return_typehint_exists = False
+        for param in sig_values:
+            if param.annotation is not _EMPTY:
+                type_annotations[param.name] = _format_annotation(param.annotation)
+                arguments_typehint_exists = True
+        if return_anno is not _EMPTY:
+            type_annotations["return"] = _format_annotation(return_anno)
+            return_typehint_exists = True
+    elif source_info is not None:
+        type_annotations = source_info.annotation_dict
+        arguments_typehint_exists = source_info.arguments_typehint_exists
+        return_typehint_exists = source_info.return_typehint_exists
+    else:
+        type_annotations = {}
+        arguments_typehint_exists = False
+        return_typehint_exists = False
 
     #############################################################################
     # Process the information about the func.
@@ -1180,17 +1489,17 @@ def generate_signature(
             # Only skip the first parameter. If the function contains both
             # `self` and `cls`, skip only the first one.
             continue
-        elif kind == param.POSITIONAL_ONLY:
+        elif kind == _POSITIONAL_ONLY:
             pos_only_args.append(param)
-        elif default is param.empty and kind == param.POSITIONAL_OR_KEYWORD:
+        elif default is _EMPTY and kind == _POSITIONAL_OR_KEYWORD:
             args.append(param)
-        elif default is not param.empty and kind == param.POSITIONAL_OR_KEYWORD:
+        elif default is not _EMPTY and kind == _POSITIONAL_OR_KEYWORD:
             kwargs.append(param)
-        elif kind == param.VAR_POSITIONAL:
+        elif kind == _VAR_POSITIONAL:
             varargs = (index, param)
-        elif kind == param.KEYWORD_ONLY:
+        elif kind == _KEYWORD_ONLY:
             only_kwargs.append(param)
-        elif kind == param.VAR_KEYWORD:
+        elif kind == _VAR_KEYWORD:
             varkwargs = param
 
     #############################################################################
@@ -1209,18 +1518,12 @@ def generate_signature(
         all_args_list.extend(formatter.format_args(args))
 
     if kwargs:
-        all_args_list.extend(
-            formatter.format_kwargs(kwargs, ast_defaults_visitor.ast_args_defaults)
-        )
+        all_args_list.extend(formatter.format_kwargs(kwargs, ast_args_defaults))
 
     if only_kwargs:
         if varargs is None:
             all_args_list.append("*")
-        all_args_list.extend(
-            formatter.format_kwargs(
-                only_kwargs, ast_defaults_visitor.ast_kw_only_defaults
-            )
-        )
+        all_args_list.extend(formatter.format_kwargs(only_kwargs, ast_kw_only_defaults))
 
     if varargs is not None:
         all_args_list.insert(varargs[0], "*" + varargs[1].name)
@@ -1230,23 +1533,52 @@ def generate_signature(
 
     if (
         return_anno
-        and return_anno is not sig.empty
+        and return_anno is not _EMPTY
         and type_annotations.get("return", None)
     ):
         return_type = formatter.format_return(return_anno)
     else:
         return_type = "None"
     all_args_list = list(map(lambda x: x.replace("&#x27;", '"'), all_args_list))
-    return _SignatureComponents(
+    components = _SignatureComponents(
         arguments=all_args_list,
         arguments_typehint_exists=arguments_typehint_exists,
         return_typehint_exists=return_typehint_exists,
         return_type=return_type,
     )
+    _SIGNATURE_CACHE[cache_key] = (func, components)
+    return components
+
+
+# Matches the docstring namedtuple generates for its field properties.
+_NAMEDTUPLE_FIELD_ALIAS_RE = re.compile("Alias for field number [0-9]+")
+
+
+def _indent_two(text: str) -> str:
+    """`textwrap.indent(text, "  ")`, minus the per-call generator setup.
+
+    Like `textwrap.indent`, whitespace-only lines are left alone.
+    """
+    if "\n" not in text:
+        return "  " + text if text.strip() else text
+    return "".join(
+        "  " + line if line.strip() else line for line in text.splitlines(True)
+    )
+
 
+# Members picked up from these bases are never documented; `ClassPageInfo`
+# drops them before doing any docstring parsing or URL resolution.
+_EXCLUDED_DEFINING_CLASSES = frozenset({object, type, tuple, BaseException, Exception})
 
+
+@functools.lru_cache(maxsize=None)
 def _get_defining_class(py_class, name):
-    for cls in inspect.getmro(py_class):
+    """Returns the MRO entry that defines `name`, cached per pair.
+
+    Class pages repeat for every alias of a class, and each page walks
+    the MRO once per member name.
+    """
+    for cls in py_class.__mro__:
         if name in cls.__dict__:
             return cls
     return None
@@ -1294,34 +1626,22 @@ class MethodInfo(NamedTuple):
 def extract_decorators(func: Any) -> List[str]:
     """Extracts the decorators on top of functions/methods.
 
+    The result comes from the per-function fused source visitor, so the
+    tree walked for the signature is not walked again. Callers get a
+    fresh copy of the list so they can extend it freely.
+
     Args:
       func: The function to extract the decorators from.
 
     Returns:
       A List of decorators.
     """
-
-    class ASTDecoratorExtractor(ast.NodeVisitor):
-        def __init__(self):
-            self.decorator_list = []
-
-        def visit_FunctionDef(self, node):  # pylint: disable=invalid-name
-            for dec in node.decorator_list:
-                self.decorator_list.append(astor.to_source(dec).strip())
-
-    visitor = ASTDecoratorExtractor()
-
-    try:
-        # Note: inspect.getsource doesn't include the decorator lines on classes,
-        # this won't work for classes until that's fixed.
-        func_source = textwrap.dedent(inspect.getsource(func))
-        func_ast = ast.parse(func_source)
-        visitor.visit(func_ast)
-    except Exception:  # pylint: disable=broad-except
-        # A wide-variety of errors can be thrown here.
-        pass
-
-    return visitor.decorator_list
+    # Note: inspect.getsource doesn't include the decorator lines on classes,
+    # this won't work for classes until that's fixed.
+    source_info = _func_source_info(func)
+    if source_info is None:
+        return []
+    return list(source_info.decorator_list)
 
 
 class PageInfo:
@@ -1356,11 +1676,15 @@ class PageInfo:
         self._defined_in = None
         self._aliases = None
         self._doc = None
+        self._short_name = None
 
     @property
     def short_name(self):
         """Returns the documented object's short name."""
-        return self.full_name.split(".")[-1]
+        # Computed once: rendering re-reads this per member reference.
+        if self._short_name is None:
+            self._short_name = self.full_name.rpartition(".")[2]
+        return self._short_name
 
     @property
     def defined_in(self):
@@ -1524,8 +1848,10 @@ class ClassPageInfo(PageInfo):
           parser_config: An instance of `ParserConfig`.
         """
         bases = []
+        reverse_index_get = parser_config.reverse_index.get
+        reference_to_url = parser_config.reference_resolver.reference_to_url
         for base in self.py_object.__mro__[1:]:
-            base_full_name = parser_config.reverse_index.get(id(base), None)
+            base_full_name = reverse_index_get(id(base))
             if base_full_name is None:
                 continue
             base_doc = _parse_md_docstring(
@@ -1534,9 +1860,7 @@ class ClassPageInfo(PageInfo):
                 self.full_name,
                 parser_config,
             )
-            base_url = parser_config.reference_resolver.reference_to_url(
-                base_full_name, relative_path
-            )
+            base_url = reference_to_url(base_full_name, relative_path)
 
             link_info = MemberInfo(
                 short_name=base_full_name.split(".")[-1],
@@ -1557,21 +1881,17 @@ class ClassPageInfo(PageInfo):
         """
         doc = member_info.doc
         # Hide useless namedtuple docs-strings.
-        if re.match("Alias for field number [0-9]+", doc.brief):
+        if _NAMEDTUPLE_FIELD_ALIAS_RE.match(doc.brief):
             doc = doc._replace(docstring_parts=[], brief="")
 
-        new_parts = [doc.brief]
         # Strip args/returns/raises from property
+        new_parts = [doc.brief]
         new_parts.extend(
-            [
-                str(part)
-                for part in doc.docstring_parts
-                if not isinstance(part, TitleBlock)
-            ]
+            str(part)
+            for part in doc.docstring_parts
+            if not isinstance(part, TitleBlock)
         )
-        new_parts = [textwrap.indent(part, "  ") for part in new_parts]
-        new_parts.append("")
-        desc = "\n".join(new_parts)
+        desc = "\n".join(_indent_two(part) for part in new_parts) + "\n"
 
         if member_info.short_name in self._namedtuplefields:
             self._namedtuplefields[member_info.short_name] = desc
@@ -1620,10 +1940,7 @@ class ClassPageInfo(PageInfo):
         # generated method on dataclasses and `inspect.getsource` doesn't work
         # on generated methods (as the source file doesn't exist) which is
         # required for signature generation.
-        if (
-            dataclasses.is_dataclass(self.py_object)
-            and member_info.short_name == "__init__"
-        ):
+        if _is_dataclass(self.py_object) and member_info.short_name == "__init__":
             py_obj = self.py_object
         else:
             py_obj = member_info.py_object
@@ -1693,35 +2010,35 @@ class ClassPageInfo(PageInfo):
           parser_config: An instance of ParserConfig.
         """
         py_class = self.py_object
-        doc_path = documentation_path(self.full_name)
-        relative_path = os.path.relpath(
-            path=".", start=os.path.dirname(doc_path) or "."
-        )
+        relative_path = _relative_path_for(self.full_name)
 
         self._set_bases(relative_path, parser_config)
 
-        for child_short_name in parser_config.tree[self.full_name]:
-            child_full_name = ".".join([self.full_name, child_short_name])
-            child = parser_config.py_name_to_object(child_full_name)
+        full_name = self.full_name
+        py_name_to_object = parser_config.py_name_to_object
+        reference_to_url = parser_config.reference_resolver.reference_to_url
+        should_skip_class_attr = doc_controls.should_skip_class_attr
+
+        for child_short_name in parser_config.tree[full_name]:
+            child_full_name = f"{full_name}.{child_short_name}"
+            child = py_name_to_object(child_full_name)
 
             # Don't document anything that is defined in object
             defining_class = _get_defining_class(py_class, child_short_name)
-            if defining_class in [object, type, tuple, BaseException, Exception]:
+            if defining_class in _EXCLUDED_DEFINING_CLASSES:
                 continue
 
-            if doc_controls.should_skip_class_attr(py_class, child_short_name):
+            if should_skip_class_attr(py_class, child_short_name):
                 continue
 
             child_doc = _parse_md_docstring(
                 child,
                 relative_path,
-                self.full_name,
+                full_name,
                 parser_config,
             )
 
-            child_url = parser_config.reference_resolver.reference_to_url(
-                child_full_name, relative_path
-            )
+            child_url = reference_to_url(child_full_name, relative_path)
 
             member_info = MemberInfo(
                 child_short_name, child_full_name, child, child_doc, child_url
@@ -1773,7 +2090,7 @@ class ClassPageInfo(PageInfo):
             # Don't overwrite existing items
             attrs.setdefault(name, desc)
 
-        if dataclasses.is_dataclass(self.py_object):
+        if _is_dataclass(self.py_object):
             for name, desc in self._dataclass_fields().items():
                 # Don't overwrite existing items
                 attrs.setdefault(name, desc)
@@ -1798,6 +2115,26 @@ class ClassPageInfo(PageInfo):
         return fields
 
 
+# Module-level machinery that never gets a docs entry.
+_SKIP_MODULE_MEMBER_NAMES = frozenset(
+    {
+        "__builtins__",
+        "__doc__",
+        "__file__",
+        "__name__",
+        "__path__",
+        "__package__",
+        "__cached__",
+        "__loader__",
+        "__spec__",
+        "absolute_import",
+        "division",
+        "print_function",
+        "unicode_literals",
+    }
+)
+
+
 class ModulePageInfo(PageInfo):
     """Collects docs for a module page.
 
@@ -1892,27 +2229,11 @@ class ModulePageInfo(PageInfo):
         Args:
           parser_config: An instance of ParserConfig.
         """
-        relative_path = os.path.relpath(
-            path=".", start=os.path.dirname(documentation_path(self.full_name)) or "."
-        )
+        relative_path = _relative_path_for(self.full_name)
 
         member_names = parser_config.tree.get(self.full_name, [])
         for member_short_name in member_names:
-            if member_short_name in [
-                "__builtins__",
-                "__doc__",
-                "__file__",
-                "__name__",
-                "__path__",
-                "__package__",
-                "__cached__",
-                "__loader__",
-                "__spec__",
-                "absolute_import",
-                "division",
-                "print_function",
-                "unicode_literals",
-            ]:
+            if member_short_name in _SKIP_MODULE_MEMBER_NAMES:
                 continue
 
             if self.full_name:
@@ -1991,9 +2312,7 @@ def docs_for_object(
     else:
         raise RuntimeError("Cannot make docs for object {full_name}: {py_object!r}")
 
-    relative_path = os.path.relpath(
-        path=".", start=os.path.dirname(documentation_path(full_name)) or "."
-    )
+    relative_path = _relative_path_for(full_name)
 
     page_info.set_doc(
         _parse_md_docstring(
@@ -2020,6 +2339,75 @@ def _unwrap_obj(obj):
     return obj
 
 
+# Pseudo-paths emitted for built-ins, like <embedded stdlib> or <string>.
+_PSEUDO_PATH_RE = re.compile(r"<[\w\s]+>")
+
+# Files generated by tf_export follow a gen_*.py naming scheme.
+_GENERATED_PATH_RE = re.compile(r".*/gen_[^/]*\.py$")
+
+
+# Source files keyed by `id(py_object)` with the object kept alive in
+# the entry; `None` is cached too, so builtins don't raise repeatedly.
+_OBJ_FILE_CACHE: Dict[int, Tuple[Any, Optional[str]]] = {}
+
+
+def _get_obj_file(py_object) -> Optional[str]:
+    """Returns the file `py_object` was defined in, or None for builtins.
+
+    Cached per object: the same classes and modules recur across
+    members and aliases, and `getfile` re-walks `__wrapped__` chains
+    every time.
+    """
+    cached = _OBJ_FILE_CACHE.get(id(py_object))
+    if cached is not None and cached[0] is py_object:
+        return cached[1]
+
+    try:
+        obj_path = inspect.getfile(_unwrap_obj(py_object))
+    except TypeError:  # getfile throws TypeError if py_object is a builtin.
+        obj_path = None
+
+    _OBJ_FILE_CACHE[id(py_object)] = (py_object, obj_path)
+    return obj_path
+
+
+@functools.lru_cache(maxsize=None)
+def _source_line_table(path: str) -> Dict[str, Tuple[int, int]]:
+    """Maps qualnames defined in `path` to their (start, end) line span.
+
+    `inspect.getsourcelines` re-reads and re-scans the whole module
+    source per object, which is quadratic in objects per file. One
+    `ast.parse` per file replaces that. Spans include decorator lines,
+    matching `getsourcelines`. Empty when the file can't be parsed.
+    """
+    lines = linecache.getlines(path)
+    if not lines:
+        return {}
+    try:
+        tree = ast.parse("".join(lines))
+    except SyntaxError:
+        return {}
+
+    table: Dict[str, Tuple[int, int]] = {}
+    stack = [(tree, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = prefix + child.name
+                start = child.lineno
+                for dec in child.decorator_list:
+                    if dec.lineno < start:
+                        start = dec.lineno
+                # First definition wins, like a sequential source scan.
+                table.setdefault(qualname, (start, child.end_lineno))
+                if isinstance(child, ast.ClassDef):
+                    stack.append((child, qualname + "."))
+                else:
+                    stack.append((child, qualname + ".<locals>."))
+    return table
+
+
 def _get_defined_in(
     py_object: Any, parser_config: ParserConfig
 ) -> Optional[_FileLocation]:
@@ -2033,39 +2421,46 @@ def _get_defined_in(
       A `_FileLocation`
     """
     # Every page gets a note about where this object is defined
-    base_dirs_and_prefixes = zip(parser_config.base_dir, parser_config.code_url_prefix)
-    try:
-        obj_path = inspect.getfile(_unwrap_obj(py_object))
-    except TypeError:  # getfile throws TypeError if py_object is a builtin.
+    obj_path = _get_obj_file(py_object)
+    if obj_path is None:
         return None
 
     if not obj_path.endswith((".py", ".pyc")):
         return None
 
     code_url_prefix = None
-    for base_dir, temp_prefix in base_dirs_and_prefixes:
-        rel_path = os.path.relpath(path=obj_path, start=base_dir)
-        # A leading ".." indicates that the file is not inside `base_dir`, and
-        # the search should continue.
-        if rel_path.startswith(".."):
-            continue
-        else:
+    abs_path = os.path.abspath(obj_path)
+    for base_dir, temp_prefix in parser_config.base_dir_index():
+        # `base_dir` ends with a separator, so a prefix match means the
+        # file is inside it.
+        if abs_path.startswith(base_dir):
             code_url_prefix = temp_prefix
+            rel_path = abs_path[len(base_dir) :]
             break
 
     # No link if the file was not found in a `base_dir`, or the prefix is None.
     if code_url_prefix is None:
         return None
 
-    try:
-        lines, start_line = inspect.getsourcelines(py_object)
-        end_line = start_line + len(lines) - 1
-        if "MACHINE GENERATED" in lines[0]:
+    qualname = getattr(py_object, "__qualname__", None)
+    span = _source_line_table(obj_path).get(qualname) if qualname else None
+    if span is not None:
+        start_line, end_line = span
+        if "MACHINE GENERATED" in linecache.getline(obj_path, start_line):
             # don't link to files generated by tf_export
             return None
-    except (IOError, TypeError, IndexError):
-        start_line = None
-        end_line = None
+    else:
+        # Modules, lambdas, and anything else the line table can't
+        # answer (e.g. a .pyc path) take the slow inspect route.
+        try:
+            lines, start_line = inspect.getsourcelines(py_object)
+            end_line = start_line + len(lines) - 1
+            if "MACHINE GENERATED" in lines[0]:
+                # don't link to files generated by tf_export
+                return None
+        except (IOError, TypeError, IndexError):
+            start_line = None
+            end_line = None
 
     # In case this is compiled, point to the original
     if rel_path.endswith(".pyc"):
@@ -2075,13 +2470,13 @@ def _get_defined_in(
         # .cpython-3x.pyc or similar are all handled.
         rel_path = rel_path.partition(".")[0] + ".py"
 
-    if re.search(r"<[\w\s]+>", rel_path):
+    if _PSEUDO_PATH_RE.search(rel_path):
         # Built-ins emit paths like <embedded stdlib>, <string>, etc.
         return None
     if "<attrs generated" in rel_path:
         return None
 
-    if re.match(r".*/gen_[^/]*\.py$", rel_path):
+    if _GENERATED_PATH_RE.match(rel_path):
         return _FileLocation()
     if "genfiles" in rel_path:
         return _FileLocation()
@@ -28,13 +28,13 @@ def build_md_page(page_info: parser.PageInfo) -> str:
       ValueError: if `page_info` is an instance of an unrecognized class
     """
     if isinstance(page_info, parser.ClassPageInfo):
-        return _build_class_page(page_info)
+        return "".join(_build_class_page(page_info))
 
     if isinstance(page_info, parser.FunctionPageInfo):
-        return _build_function_page(page_info)
+        return "".join(_build_function_page(page_info))
 
     if isinstance(page_info, parser.ModulePageInfo):
-        return _build_module_page(page_info)
+        return "".join(_build_module_page(page_info))
 
     raise ValueError(f"Unknown Page Info Type: {type(page_info)}")
 
@@ -60,7 +60,7 @@ def _format_docstring(item, *, table_title_template: Optional[str] = None) -> st
         return str(item)
 
 
-def _build_function_page(page_info: parser.FunctionPageInfo) -> str:
+def _build_function_page(page_info: parser.FunctionPageInfo) -> List[str]:
     """Constructs a markdown page given a `FunctionPageInfo` object.
 
     Args:
@@ -69,7 +69,7 @@ def _build_function_page(page_info: parser.FunctionPageInfo) -> str:
         For example, see https://www.tensorflow.org/api_docs/python/tf/concat
 
     Returns:
-      The function markdown page.
+      The parts of the function markdown page; `build_md_page` joins them.
     """
     
     # Add the full_name of the symbol to the page.
@@ -96,7 +96,7 @@ def _build_function_page(page_info: parser.FunctionPageInfo) -> str:
     if custom_content is not None:
         parts.append(custom_content)
 
-    return "".join(parts)
+    return parts
 
 
 class Methods(NamedTuple):
@@ -212,7 +212,7 @@ def merge_class_and_constructor_docstring(
     return _create_class_doc(class_doc)
 
 
-def _build_class_page(page_info: parser.ClassPageInfo) -> str:
+def _build_class_page(page_info: parser.ClassPageInfo) -> List[str]:
     """Constructs a markdown page given a `ClassPageInfo` object.
 
     Args:
@@ -221,7 +221,7 @@ def _build_class_page(page_info: parser.ClassPageInfo) -> str:
         https://www.tensorflow.org/api_docs/python/tf/data/Dataset
 
     Returns:
-      The class markdown page.
+      The parts of the class markdown page; `build_md_page` joins them.
     """
     # Add the full_name of the symbol to the page.
     title_frontmatter = f'title: {page_info.full_name.split(".")[-1]}'
@@ -262,16 +262,19 @@ def _build_class_page(page_info: parser.ClassPageInfo) -> str:
         )
         parts.append("\n\n")
 
+    # Custom content replaces the rest of the page, so check before
+    # merging and formatting the docstrings whose output it would
+    # supersede.
+    custom_content = doc_controls.get_custom_page_content(page_info.py_object)
+    if custom_content is not None:
+        parts.append(custom_content)
+        return parts
+
     # Merge the class and constructor docstring.
     parts.extend(merge_class_and_constructor_docstring(page_info, methods.constructor))
 
     parts.append("\n\n")
 
-    custom_content = doc_controls.get_custom_page_content(page_info.py_object)
-    if custom_content is not None:
-        parts.append(custom_content)
-        return "".join(parts)
-
     if page_info.attr_block is not None:
         parts.append(
             _format_docstring(page_info.attr_block, table_title_template="{title}")
@@ -295,7 +298,7 @@ def _build_class_page(page_info: parser.ClassPageInfo) -> str:
     if methods.info_dict:
         parts.append("## Methods\n\n")
         for method_name in sorted(methods.info_dict, key=_method_sort):
-            parts.append(_build_method_section(methods.info_dict[method_name]))
+            parts.extend(_build_method_section(methods.info_dict[method_name]))
         parts.append("\n\n")
 
     # Add class variables/members if they exist to the page.
@@ -307,7 +310,7 @@ def _build_class_page(page_info: parser.ClassPageInfo) -> str:
             )
         )
 
-    return "".join(parts)
+    return parts
 
 
 def _method_sort(method_name):
@@ -361,7 +364,7 @@ def _other_members(other_members: List[parser.MemberInfo], title: str):
     )
 
 
-def _build_method_section(method_info, heading_level=3):
+def _build_method_section(method_info, heading_level=3) -> List[str]:
     """Generates a markdown section for a method.
 
     Args:
@@ -369,7 +372,8 @@ def _build_method_section(method_info, heading_level=3):
       heading_level: An Int, which HTML heading level to use.
 
     Returns:
-      A markdown string.
+      The parts of the section; the caller joins them with the rest of
+      the page.
     """
     parts = []
     # heading = (
@@ -392,7 +396,7 @@ def _build_method_section(method_info, heading_level=3):
         parts.append(_format_docstring(item, table_title_template=None))
 
     parts.append("\n\n")
-    return "".join(parts)
+    return parts
 
 
 def _build_module_parts(
@@ -413,7 +417,7 @@ def _build_module_parts(
     return mod_str_parts
 
 
-def _build_module_page(page_info: parser.ModulePageInfo) -> str:
+def _build_module_page(page_info: parser.ModulePageInfo) -> List[str]:
     """Constructs a markdown page given a `ModulePageInfo` object.
 
     Args:
@@ -422,7 +426,7 @@ def _build_module_page(page_info: parser.ModulePageInfo) -> str:
         For example, see https://www.tensorflow.org/api_docs/python/tf/data
 
     Returns:
-      The module markdown page.
+      The parts of the module markdown page; `build_md_page` joins them.
     """
     
     title_frontmatter = f'title: {page_info.full_name.split(".")[-1]}'
@@ -440,17 +444,19 @@ def _build_module_page(page_info: parser.ModulePageInfo) -> str:
     # First line of the docstring i.e. a brief introduction about the symbol.
     parts.append(page_info.doc.brief + "\n\n")
 
+    # Custom content replaces the rest of the page, so check before
+    # formatting the docstring parts its presence would supersede.
+    custom_content = doc_controls.get_custom_page_content(page_info.py_object)
+    if custom_content is not None:
+        parts.append(custom_content)
+        return parts
+
     # All lines in the docstring, expect the brief introduction.
     for item in page_info.doc.docstring_parts:
         parts.append(_format_docstring(item, table_title_template=None))
 
     parts.append("\n\n")
 
-    custom_content = doc_controls.get_custom_page_content(page_info.py_object)
-    if custom_content is not None:
-        parts.append(custom_content)
-        return "".join(parts)
-
     if page_info.modules:
         parts.append("## Modules\n\n")
         parts.extend(
@@ -486,7 +492,7 @@ def _build_module_page(page_info: parser.ModulePageInfo) -> str:
             )
         )
 
-    return "".join(parts)
+    return parts
 
 
 DECORATOR_ALLOWLIST = {
@@ -1,6 +1,7 @@
 """Visitor restricting traversal to only the public tensorflow API."""
 
 import ast
+import functools
 import inspect
 import os
 import pathlib
@@ -21,9 +22,14 @@ Children = List[Tuple[str, Any]]
 ApiFilter = Callable[[Tuple[str, ...], Any, Children], Children]
 
 
+@functools.lru_cache(maxsize=None)
 def get_module_base_dirs(module) -> Tuple[pathlib.Path, ...]:
     """Returns the list of base_dirs.
 
+    The result is cached per module: `_is_private` calls this for every
+    module child it sees, and the same modules show up repeatedly during
+    a traversal.
+
     Args:
       module: A python module object.
 
@@ -338,11 +344,16 @@ class PublicAPIFilter(object):
                 "problem with an accidental public import.".format(".".join(path))
             )
 
-        # Remove things that are not visible.
+        # Remove members of `typing` and things that are not visible in a
+        # single pass over the children, rather than rebuilding the list
+        # once per filter (the id probe is much cheaper than
+        # `_is_private`, so it goes first).
+        is_private = self._is_private
         children = [
             (child_name, child_obj)
-            for child_name, child_obj in list(children)
-            if not self._is_private(path, child_name, child_obj)
+            for child_name, child_obj in children
+            if id(child_obj) not in TYPING_IDS
+            and not is_private(path, child_name, child_obj)
         ]
 
         return children
@@ -4,6 +4,10 @@ import sys
 
 __all__ = ["traverse"]
 
+# The names of the interpreter's builtin modules, as a set for O(1)
+# membership checks while traversing.
+_BUILTIN_MODULE_NAMES = frozenset(sys.builtin_module_names)
+
 
 def _filter_module_all(path, root, children):
     """Filters module children based on the "__all__" arrtibute.
@@ -42,7 +46,7 @@ def _filter_builtin_modules(path, root, children):
     filtered_children = []
     for name, child in children:
         # Do not descend into built-in modules
-        if inspect.ismodule(child) and child.__name__ in sys.builtin_module_names:
+        if inspect.ismodule(child) and child.__name__ in _BUILTIN_MODULE_NAMES:
             continue
         filtered_children.append((name, child))
     return filtered_children